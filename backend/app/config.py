@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from functools import lru_cache
 from typing import List, Optional
 import os
 
@@ -11,12 +12,24 @@ class Settings(BaseSettings):
     
     # LLM Configuration
     llm_provider: str = "ollama"  # ollama or openai
-    embedding_provider: str = "local"  # local or openai
+    embedding_provider: str = "local"  # local, onnx, static or openai
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3.2"
+    ollama_keep_alive: str = "30m"  # Keep the model and its prompt-prefix cache loaded between requests
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o-mini"
     openai_embedding_model: str = "text-embedding-3-large"
+    embedding_batch_size: int = 128
+    embedding_cache_size: int = 10000
+    query_embedding_cache_size: int = 1000  # Search queries, matched case- and padding-insensitively
+    embedding_coalesce_window_ms: int = 10
+    embedding_coalesce_max_batch: int = 128
+    embedding_num_threads: int = 0  # Torch intra-op threads for the local model; 0 = half the CPU cores
+    embedding_fp16: bool = True  # Half precision for the local model when running on CUDA
+    embedding_compile: bool = False  # BetterTransformer + torch.compile for the local model
+    onnx_model_dir: str = "./data/models/all-MiniLM-L6-v2-onnx"
+    onnx_providers: List[str] = ["CPUExecutionProvider"]
+    static_model_dir: str = "./data/models/static-retrieval-mrl-en-v1"
     
     # Vector Database
     vector_db: str = "weaviate"  # pinecone or weaviate
@@ -25,11 +38,15 @@ class Settings(BaseSettings):
     pinecone_index_name: str = "ai-support-chatbot"
     weaviate_url: str = "http://localhost:8080"
     weaviate_api_key: Optional[str] = None
+    weaviate_pq_enabled: bool = False  # Product-quantize vectors once the class is large enough
+    weaviate_pq_threshold: int = 100000
+    weaviate_pq_segments: int = 96
     
     # Data Sources
     zendesk_subdomain: Optional[str] = None
     zendesk_email: Optional[str] = None
     zendesk_token: Optional[str] = None
+    zendesk_concurrency: int = 8  # Parallel comment requests; keep under the account's rate limit
     jira_server: Optional[str] = None
     jira_email: Optional[str] = None
     jira_api_token: Optional[str] = None
@@ -45,6 +62,27 @@ class Settings(BaseSettings):
     max_retrieved_chunks: int = 5
     chunk_size: int = 500
     chunk_overlap: int = 50
+    max_concurrent_ingests: int = 4
+    upsert_batch_size: int = 256  # Chunks per vector store write when ingesting in the background
+    max_concurrent_upserts: int = 4  # Batch writes in flight while the next batch is being produced
+    skip_unchanged_chunks: bool = True  # Don't re-embed or re-write chunks whose content and metadata are unchanged
+    ingest_threads: int = 8  # Worker threads shared by all ingesters for blocking I/O
+    ingest_processes: int = 0  # Worker processes for CPU-bound PDF/DOCX parsing; 0 = one per CPU core
+    upload_tmp_dir: Optional[str] = None  # Where uploads are staged; e.g. /dev/shm to keep them in RAM
+    max_upload_bytes: int = 200 * 1024 * 1024  # Matches nginx's client_max_body_size
+    
+    # Caching
+    redis_url: Optional[str] = None  # e.g. redis://redis:6379/0; in-process cache when unset
+    cache_size: int = 10000  # Entries kept by the in-process cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl: int = 3600  # Seconds a cached answer stays valid
+    llm_cache_similarity: float = 0.95  # Minimum query cosine similarity to reuse an answer
+    chat_cache_enabled: bool = True  # Serve repeated /chat questions without retrieval or generation
+    chat_cache_ttl: int = 3600
+    chat_cache_similarity: float = 0.97
+    conversation_ttl: int = 86400  # Seconds a conversation is kept in Redis after its last message
+    max_history: int = 100  # Most recent messages kept per conversation
+    task_status_ttl: int = 3600  # Seconds an ingestion task's status is kept after its last update
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
@@ -55,5 +93,11 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+@lru_cache
+def get_settings() -> Settings:
+    """Get the cached settings instance."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+import numpy as np
 
 
 class DocumentSource(str, Enum):
@@ -25,6 +26,8 @@ class ChatRequest(BaseModel):
 
 class Source(BaseModel):
     """Source information for retrieved content."""
+    model_config = ConfigDict(frozen=True)
+    
     doc_title: str = Field(..., description="Title of the source document")
     section: Optional[str] = Field(None, description="Section within the document")
     source_type: DocumentSource = Field(..., description="Type of source")
@@ -52,6 +55,8 @@ class FeedbackRequest(BaseModel):
 
 class DocumentMetadata(BaseModel):
     """Metadata for indexed documents."""
+    model_config = ConfigDict(frozen=True)
+    
     doc_id: str = Field(..., description="Unique document identifier")
     title: str = Field(..., description="Document title")
     source_type: DocumentSource = Field(..., description="Type of source")
@@ -64,10 +69,14 @@ class DocumentMetadata(BaseModel):
 
 class DocumentChunk(BaseModel):
     """Document chunk for vector storage."""
+    # Ingestion and search build chunks from already-validated parts with
+    # model_construct; validation only runs where outside data enters
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
     chunk_id: str = Field(..., description="Unique chunk identifier")
     doc_id: str = Field(..., description="Parent document ID")
     content: str = Field(..., description="Chunk content")
-    embedding: Optional[List[float]] = Field(None, description="Vector embedding")
+    embedding: Optional[np.ndarray] = Field(None, description="Float32 vector embedding")
     metadata: DocumentMetadata = Field(..., description="Document metadata")
     chunk_index: int = Field(..., description="Chunk position in document")
 
@@ -0,0 +1,53 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import logging
+from ..models import DocumentChunk
+from .vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn filter values (lists, dicts) into a hashable form for use in keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    return value
+
+
+class SearchCoalescer:
+    """Runs one vector search for all concurrent requests with the same query, limit and filters."""
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future[List[Tuple[DocumentChunk, float]]]"] = {}
+    
+    async def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """Search the vector store, joining an identical search that is already in flight."""
+        key = (query.strip().lower(), limit, _freeze(filters or {}))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(get_vector_store().search(query=query, limit=limit, filters=filters))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug(f"Joined in-flight search for query: {query}")
+        
+        # Shield the shared search so one caller disconnecting doesn't cancel it for the others
+        return list(await asyncio.shield(task))
+
+
+# Global search coalescer instance (lazy initialization)
+_search_coalescer = None
+
+def get_search_coalescer() -> SearchCoalescer:
+    """Get the global search coalescer instance (lazy initialization)."""
+    global _search_coalescer
+    if _search_coalescer is None:
+        _search_coalescer = SearchCoalescer()
+    return _search_coalescer
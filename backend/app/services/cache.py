@@ -0,0 +1,203 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import logging
+import time
+import uuid
+import numpy as np
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class CacheStore(ABC):
+    """Abstract base class for key-value caches with expiry."""
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None if it is missing or expired."""
+        pass
+    
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store a value for `ttl` seconds."""
+        pass
+
+
+class MemoryCacheStore(CacheStore):
+    """In-process LRU cache; entries are dropped when they expire or fall off the end."""
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+class RedisCacheStore(CacheStore):
+    """Redis-backed cache shared by all API workers."""
+    
+    def __init__(self, client: "aioredis.Redis"):
+        self.client = client
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+    
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+
+class SemanticCache:
+    """Cache keyed by query text that also matches earlier queries with near-identical embeddings.
+    
+    Entries live in a CacheStore (Redis when configured); the similarity index over
+    past query embeddings is per process. invalidate() retires every entry at once.
+    """
+    
+    # Past queries kept in the similarity index per scope, and scopes kept overall
+    entries_per_scope = 256
+    max_scopes = 1024
+    
+    def __init__(self, store: CacheStore, namespace: str, threshold: float, ttl: int):
+        self.store = store
+        self.namespace = namespace
+        self.threshold = threshold
+        self.ttl = ttl
+        self._index: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._index_generation: Optional[str] = None
+    
+    async def _generation(self) -> str:
+        """Current cache generation; keys from earlier generations are never read again."""
+        value = await self.store.get(f"{self.namespace}:generation")
+        generation = value.decode() if value else "0"
+        if generation != self._index_generation:
+            self._index.clear()
+            self._index_generation = generation
+        return generation
+    
+    def _key(self, generation: str, scope: str, query: str) -> str:
+        digest = hashlib.blake2b(f"{scope}\0{query.strip().lower()}".encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self.namespace}:{generation}:{digest}"
+    
+    async def get(self, scope: str, query: str, embedding: np.ndarray) -> Optional[bytes]:
+        """Get the value cached for this query or a near-identical one in the same scope."""
+        try:
+            generation = await self._generation()
+            value = await self.store.get(self._key(generation, scope, query))
+            if value is not None:
+                return value
+            
+            entry = self._index.get(scope)
+            if entry is None:
+                return None
+            matrix, keys = entry
+            scores = matrix @ (embedding / (np.linalg.norm(embedding) or 1.0))
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return await self.store.get(keys[best])
+        except Exception as e:
+            logger.warning(f"Cache lookup failed: {e}")
+            return None
+    
+    async def set(self, scope: str, query: str, embedding: np.ndarray, value: bytes) -> None:
+        """Cache a value for a query and remember its embedding for similarity matches."""
+        try:
+            generation = await self._generation()
+            key = self._key(generation, scope, query)
+            await self.store.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache update failed: {e}")
+            return
+        
+        unit = (embedding / (np.linalg.norm(embedding) or 1.0)).astype(np.float32)
+        matrix, keys = self._index.pop(scope, (np.empty((0, unit.shape[0]), dtype=np.float32), []))
+        self._index[scope] = (
+            np.vstack([matrix, unit])[-self.entries_per_scope:],
+            (keys + [key])[-self.entries_per_scope:]
+        )
+        if len(self._index) > self.max_scopes:
+            del self._index[next(iter(self._index))]
+    
+    async def invalidate(self) -> None:
+        """Retire all cached entries, e.g. after the knowledge base changes."""
+        try:
+            await self.store.set(f"{self.namespace}:generation", uuid.uuid4().hex.encode(), self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed: {e}")
+        self._index.clear()
+        self._index_generation = None
+
+
+# Shared Redis client (lazy initialization); None when Redis is not configured
+_redis = None
+
+def get_redis() -> Optional["aioredis.Redis"]:
+    """Get the shared Redis client, or None to fall back to in-process state."""
+    global _redis
+    if _redis is None and settings.redis_url:
+        if REDIS_AVAILABLE:
+            _redis = aioredis.from_url(settings.redis_url)
+        else:
+            logger.warning("REDIS_URL is set but the redis package is not installed, using in-process state")
+    return _redis
+
+
+class CacheFactory:
+    """Factory for creating cache stores."""
+    
+    @staticmethod
+    def create_store() -> CacheStore:
+        """Create a Redis store when configured, otherwise an in-process one."""
+        client = get_redis()
+        if client is not None:
+            return RedisCacheStore(client)
+        return MemoryCacheStore(settings.cache_size)
+
+
+# Global cache store instance (lazy initialization)
+_cache_store = None
+
+def get_cache_store() -> CacheStore:
+    """Get the global cache store instance (lazy initialization)."""
+    global _cache_store
+    if _cache_store is None:
+        _cache_store = CacheFactory.create_store()
+    return _cache_store
+
+
+# Global chat response cache (lazy initialization)
+_response_cache = None
+
+def get_response_cache() -> SemanticCache:
+    """Get the global cache of /chat responses."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = SemanticCache(
+            get_cache_store(), "chat", settings.chat_cache_similarity, settings.chat_cache_ttl
+        )
+    return _response_cache
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, List, Tuple
+import functools
+import hashlib
+import re
+
+# Maps every sentence terminator to '.' so a plain str.split finds sentence ends in linear time
+_SENTENCE_END_TABLE = str.maketrans({'!': '.', '?': '.'})
+_MD_HEADER_RE = re.compile(r'^#{1,6}\s', re.MULTILINE)
+
+_CHUNK_CACHE_SIZE = 512
+_chunk_cache: "OrderedDict[Tuple[bytes, int, str], Tuple[str, ...]]" = OrderedDict()
+
+
+def _memoize_chunks(chunker: Callable[[str, int], List[str]]) -> Callable[[str, int], List[str]]:
+    """Cache a chunker's output by content digest, limit and chunker, so re-ingests skip chunking.
+    
+    Short texts bypass both the chunker and the cache.
+    """
+    mode = chunker.__name__
+    
+    @functools.wraps(chunker)
+    def wrapper(text: str, limit: int) -> List[str]:
+        # Text that already fits in one chunk needs no splitting, hashing or caching
+        if len(text) <= limit:
+            text = text.strip()
+            return [text] if text else []
+        
+        key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), limit, mode)
+        chunks = _chunk_cache.get(key)
+        if chunks is None:
+            chunks = tuple(chunker(text, limit))
+            _chunk_cache[key] = chunks
+            if len(_chunk_cache) > _CHUNK_CACHE_SIZE:
+                _chunk_cache.popitem(last=False)
+        else:
+            _chunk_cache.move_to_end(key)
+        return list(chunks)
+    
+    return wrapper
+
+
+def pack_iter(pieces: Iterable[str], sep: str, limit: int) -> Iterator[str]:
+    """Greedily join pieces with `sep` into chunks shorter than `limit` characters, lazily."""
+    buf: List[str] = []
+    current_len = 0
+    
+    for piece in pieces:
+        if buf and current_len + len(piece) >= limit:
+            yield sep.join(buf)
+            buf.clear()
+            current_len = 0
+        buf.append(piece)
+        current_len += len(piece) + len(sep)
+    
+    if buf:
+        yield sep.join(buf)
+
+
+def iter_paragraphs(blocks: Iterable[str]) -> Iterator[str]:
+    """Yield the stripped, non-empty paragraphs of each text block."""
+    for block in blocks:
+        for paragraph in block.split('\n\n'):
+            paragraph = paragraph.strip()
+            if paragraph:
+                yield paragraph
+
+
+def iter_sentences(blocks: Iterable[str]) -> Iterator[str]:
+    """Yield stripped, non-empty sentences from consecutive blocks of one text.
+    
+    The trailing fragment of each block is carried into the next one, so
+    sentences that span block boundaries (e.g. PDF pages) stay intact.
+    """
+    carry = ""
+    for block in blocks:
+        parts = (carry + block).translate(_SENTENCE_END_TABLE).split('.')
+        carry = parts.pop()
+        for sentence in parts:
+            sentence = sentence.strip()
+            if sentence:
+                yield sentence
+    
+    carry = carry.strip()
+    if carry:
+        yield carry
+
+
+def pack_paragraphs_iter(blocks: Iterable[str], limit: int) -> Iterator[str]:
+    """Chunk streamed text blocks by paragraphs."""
+    return pack_iter(iter_paragraphs(blocks), "\n\n", limit)
+
+
+def pack_sentences_iter(blocks: Iterable[str], limit: int) -> Iterator[str]:
+    """Chunk streamed text blocks by sentences."""
+    return (chunk + "." for chunk in pack_iter(iter_sentences(blocks), ". ", limit))
+
+
+def _split_markdown_sections(text: str) -> List[str]:
+    """Split markdown text before every header that starts a new line."""
+    starts = [match.start() for match in _MD_HEADER_RE.finditer(text) if match.start() > 0]
+    bounds = [0, *starts, len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+@_memoize_chunks
+def pack_paragraphs(text: str, limit: int) -> List[str]:
+    """Chunk text by paragraphs."""
+    return list(pack_paragraphs_iter([text], limit))
+
+
+@_memoize_chunks
+def pack_sentences(text: str, limit: int) -> List[str]:
+    """Chunk text by sentences."""
+    return list(pack_sentences_iter([text], limit))
+
+
+@_memoize_chunks
+def pack_markdown(text: str, limit: int) -> List[str]:
+    """Chunk markdown by headers, splitting oversized sections by paragraphs."""
+    sections = _split_markdown_sections(text)
+    if len(sections) == 1:
+        # No headers found, use paragraph-based chunking
+        return list(pack_paragraphs_iter([text], limit))
+    
+    chunks = []
+    for section in sections:
+        section = section.strip()
+        if not section:
+            continue
+        
+        if len(section) <= limit:
+            chunks.append(section)
+        else:
+            chunks.extend(pack_paragraphs_iter([section], limit))
+    return chunks
@@ -0,0 +1,220 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Set
+import hashlib
+import logging
+import orjson
+from ..models import DocumentChunk
+from .cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def _summarize(chunks: List[DocumentChunk]) -> Dict[str, Dict[str, Any]]:
+    """Per-document listing fields for a batch of chunks, keyed by doc_id."""
+    documents = {}
+    for chunk in chunks:
+        document = documents.get(chunk.doc_id)
+        if document is None:
+            document = documents[chunk.doc_id] = {
+                "id": chunk.doc_id,
+                "title": chunk.metadata.title,
+                "source_type": chunk.metadata.source_type.value,
+                "created_at": chunk.metadata.created_at.isoformat(),
+                "product_version": chunk.metadata.product_version,
+                "chunks_count": 0
+            }
+        # Chunk indexes are dense, so the highest one gives the count even across batches
+        document["chunks_count"] = max(document["chunks_count"], chunk.chunk_index + 1)
+    return documents
+
+
+def _chunk_digests(chunks: List[DocumentChunk]) -> List[str]:
+    """Digest of each chunk's stored content and metadata."""
+    # Chunks of a document share one metadata object, so it is serialized once per document.
+    # created_at is left out: re-ingesting an unchanged record shouldn't count as a change.
+    metadata_digests: Dict[int, bytes] = {}
+    digests = []
+    for chunk in chunks:
+        metadata = chunk.metadata
+        metadata_digest = metadata_digests.get(id(metadata))
+        if metadata_digest is None:
+            metadata_digest = metadata_digests[id(metadata)] = hashlib.blake2b(orjson.dumps(
+                [metadata.title, metadata.source_type.value, metadata.product_version,
+                 sorted(metadata.tags), metadata.metadata],
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            ), digest_size=16).digest()
+        
+        digest = hashlib.blake2b(chunk.content.encode("utf-8"), digest_size=16, key=metadata_digest)
+        digests.append(digest.hexdigest())
+    return digests
+
+
+class DocumentIndex(ABC):
+    """Side index of ingested documents, so listing them doesn't scan every chunk."""
+    
+    # Whether the index survives restarts and is shared between workers
+    persistent: bool = False
+    
+    @abstractmethod
+    async def add_chunks(self, chunks: List[DocumentChunk]) -> None:
+        """Record the documents that a batch of upserted chunks belongs to."""
+        pass
+    
+    @abstractmethod
+    async def remove(self, doc_id: str) -> None:
+        """Forget a document."""
+        pass
+    
+    @abstractmethod
+    async def list_documents(self) -> List[Dict[str, Any]]:
+        """List all recorded documents."""
+        pass
+    
+    @abstractmethod
+    async def unchanged_chunks(self, chunks: List[DocumentChunk]) -> Set[str]:
+        """IDs of the chunks already recorded with identical content and metadata."""
+        pass
+    
+    @abstractmethod
+    async def version(self) -> int:
+        """Counter that changes whenever documents are added or removed."""
+        pass
+
+
+class MemoryDocumentIndex(DocumentIndex):
+    """Per-process document index."""
+    
+    def __init__(self):
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._digests: Dict[str, Dict[str, str]] = {}
+        self._version = 0
+    
+    async def add_chunks(self, chunks: List[DocumentChunk]) -> None:
+        for doc_id, document in _summarize(chunks).items():
+            existing = self._documents.get(doc_id)
+            if existing is not None:
+                document["chunks_count"] = max(document["chunks_count"], existing["chunks_count"])
+            self._documents[doc_id] = document
+        for chunk, digest in zip(chunks, _chunk_digests(chunks)):
+            self._digests.setdefault(chunk.doc_id, {})[chunk.chunk_id] = digest
+        self._version += 1
+    
+    async def remove(self, doc_id: str) -> None:
+        self._documents.pop(doc_id, None)
+        self._digests.pop(doc_id, None)
+        self._version += 1
+    
+    async def unchanged_chunks(self, chunks: List[DocumentChunk]) -> Set[str]:
+        return {
+            chunk.chunk_id
+            for chunk, digest in zip(chunks, _chunk_digests(chunks))
+            if self._digests.get(chunk.doc_id, {}).get(chunk.chunk_id) == digest
+        }
+    
+    async def list_documents(self) -> List[Dict[str, Any]]:
+        return list(self._documents.values())
+    
+    async def version(self) -> int:
+        return self._version
+
+
+class RedisDocumentIndex(DocumentIndex):
+    """Redis document index: a hash of fields per document plus a sorted set of chunk counts."""
+    
+    persistent = True
+    counts_key = "docs"
+    version_key = "docs:version"
+    
+    def __init__(self, client):
+        self.client = client
+    
+    @staticmethod
+    def _key(doc_id: str) -> str:
+        return f"docs:{doc_id}"
+    
+    @staticmethod
+    def _digests_key(doc_id: str) -> str:
+        return f"docs:{doc_id}:chunks"
+    
+    async def add_chunks(self, chunks: List[DocumentChunk]) -> None:
+        documents = _summarize(chunks)
+        if not documents:
+            return
+        
+        async with self.client.pipeline(transaction=False) as pipe:
+            for doc_id, document in documents.items():
+                fields = {k: v for k, v in document.items() if k not in ("id", "chunks_count") and v is not None}
+                pipe.hset(self._key(doc_id), mapping=fields)
+            # GT keeps the largest count seen, so re-upserting a batch doesn't shrink it
+            pipe.zadd(self.counts_key, {doc_id: d["chunks_count"] for doc_id, d in documents.items()}, gt=True)
+            for doc_id, digests in self._digests_by_document(chunks).items():
+                pipe.hset(self._digests_key(doc_id), mapping=digests)
+            pipe.incr(self.version_key)
+            await pipe.execute()
+    
+    async def remove(self, doc_id: str) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrem(self.counts_key, doc_id)
+            pipe.delete(self._key(doc_id), self._digests_key(doc_id))
+            pipe.incr(self.version_key)
+            await pipe.execute()
+    
+    @staticmethod
+    def _digests_by_document(chunks: List[DocumentChunk]) -> Dict[str, Dict[str, str]]:
+        """Chunk digests grouped by doc_id."""
+        grouped: Dict[str, Dict[str, str]] = {}
+        for chunk, digest in zip(chunks, _chunk_digests(chunks)):
+            grouped.setdefault(chunk.doc_id, {})[chunk.chunk_id] = digest
+        return grouped
+    
+    async def unchanged_chunks(self, chunks: List[DocumentChunk]) -> Set[str]:
+        grouped = self._digests_by_document(chunks)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for doc_id, digests in grouped.items():
+                pipe.hmget(self._digests_key(doc_id), list(digests))
+            stored = await pipe.execute()
+        
+        unchanged = set()
+        for digests, stored_digests in zip(grouped.values(), stored):
+            for (chunk_id, digest), stored_digest in zip(digests.items(), stored_digests):
+                if stored_digest is not None and stored_digest.decode() == digest:
+                    unchanged.add(chunk_id)
+        return unchanged
+    
+    async def list_documents(self) -> List[Dict[str, Any]]:
+        counts = await self.client.zrange(self.counts_key, 0, -1, withscores=True)
+        if not counts:
+            return []
+        
+        async with self.client.pipeline(transaction=False) as pipe:
+            for doc_id, _ in counts:
+                pipe.hgetall(self._key(doc_id.decode()))
+            records = await pipe.execute()
+        
+        documents = []
+        for (doc_id, count), record in zip(counts, records):
+            fields = {k.decode(): v.decode() for k, v in record.items()}
+            documents.append({
+                "id": doc_id.decode(),
+                "title": fields.get("title", ""),
+                "source_type": fields.get("source_type", ""),
+                "created_at": fields.get("created_at", ""),
+                "product_version": fields.get("product_version"),
+                "chunks_count": int(count)
+            })
+        return documents
+    
+    async def version(self) -> int:
+        return int(await self.client.get(self.version_key) or 0)
+
+
+# Global document index instance (lazy initialization)
+_document_index = None
+
+def get_document_index() -> DocumentIndex:
+    """Get the global document index, backed by Redis when configured."""
+    global _document_index
+    if _document_index is None:
+        client = get_redis()
+        _document_index = RedisDocumentIndex(client) if client is not None else MemoryDocumentIndex()
+    return _document_index
@@ -1,60 +1,495 @@
-from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import openai
 from ..config import settings
+from .http_client import get_http_client
+import asyncio
+import base64
+import hashlib
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 
-class EmbeddingProvider(ABC):
-    """Abstract base class for embedding providers."""
+def abstract(method):
+    """Mark a method as abstract without making the class use ABCMeta."""
+    method.__isabstractmethod__ = True
+    return method
+
+
+def _abstract_names(cls) -> frozenset:
+    """Names of methods still marked abstract on a class."""
+    return frozenset(
+        name for name in dir(cls)
+        if getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+    )
+
+
+class EmbeddingProvider:
+    """Base class for embedding providers.
+    
+    Uses a plain metaclass so isinstance checks take CPython's fast path;
+    setting __abstractmethods__ still makes object.__new__ refuse to
+    instantiate classes with unimplemented methods.
+    """
     
-    @abstractmethod
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
+    # Whether embeddings are L2-normalized, letting vector stores use dot product
+    normalized: bool = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__abstractmethods__ = _abstract_names(cls)
+    
+    @abstract
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate a float32 array of shape (len(texts), dimension)."""
         pass
     
-    @abstractmethod
-    async def generate_single_embedding(self, text: str) -> List[float]:
-        """Generate embedding for a single text."""
+    @abstract
+    async def generate_single_embedding(self, text: str) -> np.ndarray:
+        """Generate a float32 embedding vector for a single text."""
         pass
     
-    @abstractmethod
+    @abstract
     def get_dimension(self) -> int:
         """Get the dimension of the embeddings."""
         pass
 
 
+EmbeddingProvider.__abstractmethods__ = _abstract_names(EmbeddingProvider)
+
+
+class EmbeddingCache:
+    """LRU cache of embeddings keyed by a BLAKE2b digest of the input text."""
+    
+    def __init__(self, capacity: int, dimension: int):
+        self.capacity = capacity
+        self.dimension = dimension
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+    
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def _get(self, key: bytes) -> Optional[np.ndarray]:
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+        return embedding
+    
+    def _put(self, key: bytes, embedding) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32)
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return embedding
+    
+    async def embed(
+        self,
+        texts: List[str],
+        compute: Callable[[List[str]], Awaitable[np.ndarray]]
+    ) -> np.ndarray:
+        """Embed texts, sending only distinct cache misses to `compute`."""
+        keys = [self._key(text) for text in texts]
+        
+        found = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            embedding = self._get(key)
+            if embedding is None:
+                missing[key] = text
+            else:
+                found[key] = embedding
+        
+        if missing:
+            computed = await compute(list(missing.values()))
+            for key, embedding in zip(missing, computed):
+                found[key] = self._put(key, embedding)
+        
+        if not keys:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+    
+    async def embed_one(
+        self,
+        text: str,
+        compute: Callable[[str], Awaitable[np.ndarray]]
+    ) -> np.ndarray:
+        """Embed a single text, calling `compute` only on a cache miss."""
+        key = self._key(text)
+        embedding = self._get(key)
+        if embedding is None:
+            embedding = self._put(key, await compute(text))
+        return embedding
+
+
+class QueryEmbeddingCache(EmbeddingCache):
+    """Embedding cache for search queries, keyed on trimmed, lower-cased text."""
+    
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return EmbeddingCache._key(text.strip().lower())
+
+
+class EmbeddingCoalescer:
+    """Collects concurrent single-text requests and embeds them as one batch."""
+    
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Awaitable[np.ndarray]],
+        window_ms: float,
+        max_batch: int
+    ):
+        self.encode = encode
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, text: str) -> np.ndarray:
+        """Queue a text to be embedded together with concurrent requests."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._spawn_flush(self._flush())
+        elif self._flush_timer is None:
+            self._flush_timer = self._spawn_flush(self._flush_after_window())
+        
+        return await future
+    
+    def _spawn_flush(self, coro) -> asyncio.Task:
+        """Run a flush in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        return task
+    
+    async def _flush_after_window(self) -> None:
+        """Wait for the coalescing window to close, then flush the queue."""
+        await asyncio.sleep(self.window_ms / 1000)
+        self._flush_timer = None
+        await self._flush()
+    
+    async def _flush(self) -> None:
+        """Embed all queued texts in one call and resolve their futures."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        try:
+            embeddings = await self.encode([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
 class LocalEmbeddingProvider(EmbeddingProvider):
     """Local embedding provider using SentenceTransformers."""
     
+    normalized = True
+    
     def __init__(self):
+        # The Rust tokenizer parallelizes batch encoding across its own threads
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+        num_threads = settings.embedding_num_threads or max(1, (os.cpu_count() or 2) // 2)
+        os.environ.setdefault("OMP_NUM_THREADS", str(num_threads))
+        os.environ.setdefault("MKL_NUM_THREADS", str(num_threads))
+        
+        import torch
+        from sentence_transformers import SentenceTransformer, models
+        
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(2)
+        except RuntimeError:
+            # Only settable before any inter-op parallel work has started
+            pass
+        
         # Using a more compatible model that doesn't require trust_remote_code
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        # low_cpu_mem_usage loads the safetensors weights through mmap, so worker
+        # processes share the page cache instead of each holding a private copy
+        transformer = models.Transformer(
+            'sentence-transformers/all-MiniLM-L6-v2',
+            max_seq_length=256,
+            model_args={"low_cpu_mem_usage": True}
+        )
+        pooling = models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode="mean")
+        self.model = SentenceTransformer(modules=[transformer, pooling, models.Normalize()])
+        self.tokenizer = self.model.tokenizer  # fast (Rust) tokenizer
+        self.max_length = self.model.max_seq_length
         self.dimension = 384  # all-MiniLM-L6-v2 dimension
+        self.cache = EmbeddingCache(settings.embedding_cache_size, self.dimension)
+        # Queries arriving in the same event-loop tick share one forward pass
+        self.coalescer = EmbeddingCoalescer(self._encode, 0, settings.embedding_coalesce_max_batch)
+        
+        if settings.embedding_fp16 and self.model.device.type == "cuda":
+            # Half precision uses tensor cores; outputs are normalized and cast back to float32
+            self.model.half()
+        
+        if settings.embedding_compile:
+            self._compile()
+    
+    def _compile(self) -> None:
+        """Fuse attention with BetterTransformer and compile the encoder with torch.compile."""
+        transformer = self.model[0]
+        original_model = transformer.auto_model
+        try:
+            import torch
+            from optimum.bettertransformer import BetterTransformer
+            
+            # keep_original_model leaves the eager module intact for the fallback below
+            transformer.auto_model = BetterTransformer.transform(original_model, keep_original_model=True)
+            transformer.auto_model = torch.compile(
+                transformer.auto_model, mode="reduce-overhead", dynamic=True
+            )
+            
+            # Trigger compilation now rather than on the first request
+            self.model.encode(["warmup"], convert_to_numpy=True)
+            logger.info("Compiled local embedding model")
+        except Exception as e:
+            # Don't leave a half-transformed module in place for requests to hit
+            transformer.auto_model = original_model
+            logger.error(f"Error compiling embedding model, falling back to eager mode: {e}")
     
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts."""
+        return await self.cache.embed(texts, self._encode)
+    
+    async def generate_single_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text."""
+        return await self.cache.embed_one(text, self.coalescer.submit)
+    
+    def _forward(self, features) -> np.ndarray:
+        """Run the transformer on a tokenized batch, mean-pool and L2-normalize."""
+        import torch
+        
+        with torch.inference_mode():
+            features = {name: tensor.to(self.model.device) for name, tensor in features.items()}
+            token_embeddings = self.model[0].auto_model(**features, return_dict=False)[0]
+            
+            # Mean pooling over non-padding tokens, as in the SentenceTransformers pipeline
+            mask = features["attention_mask"].unsqueeze(-1).to(token_embeddings.dtype)
+            embeddings = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            embeddings = torch.nn.functional.normalize(embeddings, dim=-1)
+            return embeddings.float().cpu().numpy()
+    
+    def _encode_sorted(self, texts: List[str]) -> np.ndarray:
+        """Tokenize once, then encode length-sorted mini-batches (blocking)."""
+        # Tokenize without padding to get true lengths so each batch
+        # only pads to its own longest text
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind="stable")
+        
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        batch_size = settings.embedding_batch_size
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            features = self.tokenizer.pad(
+                {key: [encoded[key][i] for i in batch] for key in encoded.keys()},
+                return_tensors="pt"
+            )
+            embeddings[batch] = self._forward(features)
+        
+        return embeddings
+    
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts that missed the cache."""
         try:
-            # SentenceTransformer.encode is synchronous, but we can make it async-friendly
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
-            return embeddings.tolist()
+            # Run off the event loop; PyTorch releases the GIL inside its kernels
+            return await asyncio.to_thread(self._encode_sorted, texts)
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
             raise
     
-    async def generate_single_embedding(self, text: str) -> List[float]:
+    def get_dimension(self) -> int:
+        """Get embedding dimension."""
+        return self.dimension
+
+
+class ONNXEmbeddingProvider(EmbeddingProvider):
+    """Local embedding provider running an INT8-quantized ONNX export of all-MiniLM-L6-v2."""
+    
+    normalized = True
+    model_id = "sentence-transformers/all-MiniLM-L6-v2"
+    quantized_file = "model_optimized_quantized.onnx"
+    
+    def __init__(self):
+        from onnxruntime import InferenceSession
+        from transformers import AutoTokenizer
+        
+        model_dir = settings.onnx_model_dir
+        if not os.path.exists(os.path.join(model_dir, self.quantized_file)):
+            self._export_model(model_dir)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = InferenceSession(
+            os.path.join(model_dir, self.quantized_file),
+            providers=settings.onnx_providers
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.max_length = 256  # all-MiniLM-L6-v2 max_seq_length
+        self.dimension = 384
+        self.cache = EmbeddingCache(settings.embedding_cache_size, self.dimension)
+        # Queries arriving in the same event-loop tick share one inference call
+        self.coalescer = EmbeddingCoalescer(self._encode, 0, settings.embedding_coalesce_max_batch)
+    
+    def _export_model(self, model_dir: str) -> None:
+        """Export, graph-optimize and dynamically quantize the model once."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTOptimizer, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+        from transformers import AutoTokenizer
+        
+        logger.info(f"Exporting {self.model_id} to ONNX in {model_dir}")
+        model = ORTModelForFeatureExtraction.from_pretrained(self.model_id, export=True)
+        
+        optimizer = ORTOptimizer.from_pretrained(model)
+        optimizer.optimize(
+            save_dir=model_dir,
+            optimization_config=OptimizationConfig(optimization_level=99)
+        )
+        
+        quantizer = ORTQuantizer.from_pretrained(model_dir, file_name="model_optimized.onnx")
+        quantizer.quantize(
+            save_dir=model_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        )
+        
+        AutoTokenizer.from_pretrained(self.model_id).save_pretrained(model_dir)
+    
+    def _run(self, encoded) -> np.ndarray:
+        """Run the ONNX session on a tokenized batch, mean-pool and L2-normalize."""
+        inputs = {name: value for name, value in encoded.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+        
+        # Mean pooling over non-padding tokens, as in the SentenceTransformers pipeline
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+    
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts."""
+        return await self.cache.embed(texts, self._encode)
+    
+    async def generate_single_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text."""
+        return await self.cache.embed_one(text, self.coalescer.submit)
+    
+    def _encode_sorted(self, texts: List[str]) -> np.ndarray:
+        """Tokenize once, then encode length-sorted mini-batches (blocking)."""
+        # Tokenize without padding to get true lengths so each batch
+        # only pads to its own longest text
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind="stable")
+        
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        batch_size = settings.embedding_batch_size
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            features = self.tokenizer.pad(
+                {key: [encoded[key][i] for i in batch] for key in encoded.keys()},
+                return_tensors="np"
+            )
+            embeddings[batch] = self._run(features)
+        
+        return embeddings
+    
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts that missed the cache."""
+        try:
+            # ONNX Runtime releases the GIL, so inference can run off the event loop
+            return await asyncio.to_thread(self._encode_sorted, texts)
+        except Exception as e:
+            logger.error(f"Error generating embeddings with ONNX Runtime: {e}")
+            raise
+    
+    def get_dimension(self) -> int:
+        """Get embedding dimension."""
+        return self.dimension
+
+
+class StaticEmbeddingProvider(EmbeddingProvider):
+    """Local embedding provider averaging rows of a static token-embedding table."""
+    
+    normalized = True
+    model_id = "sentence-transformers/static-retrieval-mrl-en-v1"
+    table_file = "embeddings.npy"
+    tokenizer_file = "tokenizer.json"
+    
+    def __init__(self):
+        from tokenizers import Tokenizer
+        
+        model_dir = settings.static_model_dir
+        if not os.path.exists(os.path.join(model_dir, self.table_file)):
+            self._export_model(model_dir)
+        
+        self.table = np.load(os.path.join(model_dir, self.table_file)).astype(np.float32, copy=False)
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, self.tokenizer_file))
+        self.dimension = self.table.shape[1]
+        self.cache = EmbeddingCache(settings.embedding_cache_size, self.dimension)
+    
+    def _export_model(self, model_dir: str) -> None:
+        """Download the embedding table and tokenizer and store the table as .npy."""
+        from huggingface_hub import hf_hub_download
+        from safetensors.numpy import load_file
+        
+        logger.info(f"Downloading {self.model_id} to {model_dir}")
+        os.makedirs(model_dir, exist_ok=True)
+        weights = load_file(hf_hub_download(self.model_id, "0_StaticEmbedding/model.safetensors"))
+        np.save(os.path.join(model_dir, self.table_file), weights["embedding.weight"].astype(np.float32))
+        
+        tokenizer_path = hf_hub_download(self.model_id, f"0_StaticEmbedding/{self.tokenizer_file}")
+        with open(tokenizer_path, "rb") as src, open(os.path.join(model_dir, self.tokenizer_file), "wb") as dst:
+            dst.write(src.read())
+    
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts."""
+        return await self.cache.embed(texts, self._encode)
+    
+    async def generate_single_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for a single text."""
+        return await self.cache.embed_one(text, self._encode_single)
+    
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts that missed the cache."""
         try:
-            embedding = self.model.encode([text], convert_to_numpy=True)
-            return embedding[0].tolist()
+            encodings = self.tokenizer.encode_batch(texts, add_special_tokens=False)
+            lengths = np.fromiter((len(e.ids) for e in encodings), dtype=np.int64, count=len(texts))
+            ids = np.fromiter((i for e in encodings for i in e.ids), dtype=np.int64, count=int(lengths.sum()))
+            
+            # Sum each text's rows in one pass; texts without tokens stay zero
+            embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+            non_empty = lengths > 0
+            if non_empty.any():
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+                embeddings[non_empty] = np.add.reduceat(self.table[ids], offsets, axis=0)
+            
+            # Mean pooling is a scale, so normalizing the sum gives the same vector
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return embeddings / np.clip(norms, 1e-12, None)
         except Exception as e:
-            logger.error(f"Error generating single embedding: {e}")
+            logger.error(f"Error generating static embeddings: {e}")
             raise
     
+    async def _encode_single(self, text: str) -> np.ndarray:
+        """Encode a single text that missed the cache."""
+        return (await self._encode([text]))[0]
+    
     def get_dimension(self) -> int:
         """Get embedding dimension."""
         return self.dimension
@@ -63,40 +498,58 @@ class LocalEmbeddingProvider(EmbeddingProvider):
 class OpenAIEmbeddingProvider(EmbeddingProvider):
     """OpenAI embedding provider."""
     
+    normalized = True
+    
     def __init__(self):
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key is required")
         
-        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        # Shared keep-alive HTTP/2 pool, so embedding and LLM calls reuse warm TLS connections
+        self.client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+            timeout=30.0,
+            max_retries=3
+        )
         self.model = settings.openai_embedding_model
         self.dimension = 3072 if "3-large" in self.model else 1536  # text-embedding-3-large vs others
+        self.cache = EmbeddingCache(settings.embedding_cache_size, self.dimension)
+        
+        # Single-text requests are coalesced into one API call per time window
+        self.coalescer = EmbeddingCoalescer(
+            self._encode,
+            settings.embedding_coalesce_window_ms,
+            settings.embedding_coalesce_max_batch
+        )
     
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using OpenAI API."""
-        try:
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=texts
-            )
-            
-            return [data.embedding for data in response.data]
-            
-        except Exception as e:
-            logger.error(f"Error generating embeddings with OpenAI: {e}")
-            raise
+        return await self.cache.embed(texts, self._encode)
     
-    async def generate_single_embedding(self, text: str) -> List[float]:
+    async def generate_single_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for a single text."""
+        return await self.cache.embed_one(text, self.coalescer.submit)
+    
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts that missed the cache."""
         try:
+            # Asking for base64 explicitly makes the SDK hand back the raw float32
+            # buffers instead of decoding them into Python float lists
             response = await self.client.embeddings.create(
                 model=self.model,
-                input=[text]
+                input=texts,
+                encoding_format="base64"
             )
             
-            return response.data[0].embedding
+            embeddings = np.stack([
+                np.frombuffer(base64.b64decode(data.embedding), dtype=np.float32)
+                for data in response.data
+            ])
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+            return embeddings
             
         except Exception as e:
-            logger.error(f"Error generating single embedding with OpenAI: {e}")
+            logger.error(f"Error generating embeddings with OpenAI: {e}")
             raise
     
     def get_dimension(self) -> int:
@@ -107,16 +560,39 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
 class EmbeddingFactory:
     """Factory for creating embedding providers."""
     
+    _PROVIDERS = {
+        "local": LocalEmbeddingProvider,
+        "onnx": ONNXEmbeddingProvider,
+        "static": StaticEmbeddingProvider,
+        "openai": OpenAIEmbeddingProvider,
+    }
+    
     @staticmethod
     def create_provider() -> EmbeddingProvider:
         """Create embedding provider based on configuration."""
-        if settings.embedding_provider.lower() == "local":
-            return LocalEmbeddingProvider()
-        elif settings.embedding_provider.lower() == "openai":
-            return OpenAIEmbeddingProvider()
-        else:
+        provider_class = EmbeddingFactory._PROVIDERS.get(settings.embedding_provider.strip().lower())
+        if provider_class is None:
             raise ValueError(f"Unsupported embedding provider: {settings.embedding_provider}")
+        return provider_class()
+
+
+# Global embedding provider instance (lazy initialization)
+_embedding_provider = None
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get the global embedding provider instance (lazy initialization)."""
+    global _embedding_provider
+    if _embedding_provider is None:
+        _embedding_provider = EmbeddingFactory.create_provider()
+    return _embedding_provider
+
 
+_query_embedding_cache = None
 
-# Global embedding provider instance
-embedding_provider = EmbeddingFactory.create_provider()
+async def get_query_embedding(query: str) -> np.ndarray:
+    """Embed a search query, reusing the vector of an earlier query that differs only in case or padding."""
+    global _query_embedding_cache
+    provider = get_embedding_provider()
+    if _query_embedding_cache is None:
+        _query_embedding_cache = QueryEmbeddingCache(settings.query_embedding_cache_size, provider.get_dimension())
+    return await _query_embedding_cache.embed_one(query, provider.generate_single_embedding)
@@ -0,0 +1,29 @@
+from typing import Optional
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive HTTP/2 pool shared by the LLM and embedding providers; created
+# lazily inside the running event loop and closed on app shutdown
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared outbound HTTP client (lazy initialization)."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=2048, max_keepalive_connections=1024),
+            timeout=60.0
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared outbound HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional
 import asyncio
-import aiofiles
+import functools
 import fitz  # PyMuPDF
 import logging
+import multiprocessing
 
 # Initialize logger early
 logger = logging.getLogger(__name__)
@@ -20,27 +24,128 @@ except ImportError:
 
 from docx import Document
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from zenpy import Zenpy
 from jira import JIRA
 from ..config import settings
 from ..models import DocumentChunk, DocumentMetadata, DocumentSource
+from .chunking import (
+    pack_markdown, pack_paragraphs, pack_paragraphs_iter,
+    pack_sentences, pack_sentences_iter
+)
 import uuid
-import re
 import os
 from datetime import datetime
+from pathlib import Path
+
+# Rejoin words hyphenated across line breaks during extraction instead of in a later pass
+_PDF_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_DEHYPHENATE
+
+# The requests default of 10 pooled connections queues concurrent Zendesk/Jira calls
+_HTTP_POOL_SIZE = 64
+
+
+def _mount_pooled_adapter(session: requests.Session) -> requests.Session:
+    """Give a requests session a larger connection pool and retries with backoff."""
+    adapter = HTTPAdapter(
+        pool_connections=_HTTP_POOL_SIZE,
+        pool_maxsize=_HTTP_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+def _pdf_chunks(file_path: str) -> List[str]:
+    """Chunk the text layer of a PDF page by page, without building the full text (blocking)."""
+    # MuPDF is not thread-safe, so pages are read sequentially in one worker
+    with fitz.open(file_path) as doc:
+        pages = (page.get_text("text", flags=_PDF_TEXT_FLAGS) for page in doc)
+        return list(pack_sentences_iter(pages, settings.chunk_size))
+
+
+def _docx_chunks(file_path: str) -> List[str]:
+    """Parse a DOCX file and chunk it paragraph by paragraph (blocking)."""
+    paragraphs = (paragraph.text for paragraph in Document(file_path).paragraphs)
+    return list(pack_paragraphs_iter(paragraphs, settings.chunk_size))
+
+
+# Worker processes for CPU-bound parsing (lazy initialization), so it doesn't hold the GIL
+# that the event loop needs to keep serving requests
+_process_pool = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared parsing process pool."""
+    global _process_pool
+    if _process_pool is None:
+        # forkserver children don't inherit the event loop or the API's threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.ingest_processes or os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _process_pool
+
+
+def _safe_unlink(file_path: str) -> None:
+    """Remove a temporary file, logging instead of raising on failure."""
+    try:
+        os.unlink(file_path)
+        logger.info(f"Cleaned up temporary file: {file_path}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to clean up temporary file {file_path}: {e}")
 
 
 class DataIngester(ABC):
     """Abstract base class for data ingesters."""
     
+    # Shared pool for blocking parser and client calls; set by IngestionService
+    executor: Optional[Executor] = None
+    
+    async def _run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking call on the shared ingestion thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(fn, *args, **kwargs)
+        )
+    
+    async def _run_cpu(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a CPU-bound, picklable call on the shared parsing process pool."""
+        global _process_pool
+        pool = _get_process_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. a parser crash on a malformed file); later calls get a fresh pool
+            if _process_pool is pool:
+                _process_pool = None
+            pool.shutdown(wait=False)
+            raise
+    
+    def _schedule_unlink(self, file_path: str) -> None:
+        """Delete a temporary file on the thread pool without waiting for it."""
+        asyncio.get_running_loop().run_in_executor(self.executor, _safe_unlink, file_path)
+    
+    def _release_input(self, file_path: str, filters: Dict[str, Any]) -> None:
+        """Delete an input file once read if it is a staged upload (`delete_after_ingest`);
+        files named directly, e.g. by the CLI or a config file, are left in place."""
+        if filters.get("delete_after_ingest"):
+            self._schedule_unlink(file_path)
+    
     @abstractmethod
     async def ingest(self, filters: Optional[Dict[str, Any]] = None) -> List[DocumentChunk]:
         """Ingest data and return document chunks."""
         pass
+    
+    async def iter_chunks(self, filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[DocumentChunk]:
+        """Yield document chunks as they are produced; paginated sources override this to stream."""
+        for chunk in await self.ingest(filters):
+            yield chunk
 
 
 class PDFIngester(DataIngester):
-    """PDF document ingester using PyMuPDF and unstructured."""
+    """PDF document ingester using PyMuPDF, with unstructured for high-fidelity parsing."""
     
     async def ingest(self, filters: Optional[Dict[str, Any]] = None) -> List[DocumentChunk]:
         """Ingest PDF documents."""
@@ -51,37 +156,24 @@ class PDFIngester(DataIngester):
         try:
             logger.info(f"Starting PDF ingestion for: {file_path}")
             
-            # Try unstructured first for better text extraction
-            if UNSTRUCTURED_AVAILABLE:
+            # Native extraction is much faster; unstructured's layout models are opt-in
+            if filters.get("high_fidelity") and UNSTRUCTURED_AVAILABLE:
                 try:
-                    elements = partition_pdf(filename=file_path)
-                    text_content = "\n\n".join([str(element) for element in elements])
+                    elements = await self._run(partition_pdf, filename=file_path)
+                    text_content = "\n\n".join(map(str, elements))
                     logger.info(f"Extracted {len(text_content)} characters using unstructured")
+                    chunks = pack_sentences(text_content, settings.chunk_size)
                 except Exception as e:
                     logger.warning(f"Unstructured failed, falling back to PyMuPDF: {e}")
                     # Fallback to PyMuPDF
-                    doc = fitz.open(file_path)
-                    text_content = ""
-                    for page_num in range(len(doc)):
-                        page = doc.load_page(page_num)
-                        text_content += page.get_text()
-                    doc.close()
-                    logger.info(f"Extracted {len(text_content)} characters using PyMuPDF")
+                    chunks = await self._run_cpu(_pdf_chunks, file_path)
             else:
                 # Use PyMuPDF directly
-                doc = fitz.open(file_path)
-                text_content = ""
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text_content += page.get_text()
-                doc.close()
-                logger.info(f"Extracted {len(text_content)} characters using PyMuPDF")
+                chunks = await self._run_cpu(_pdf_chunks, file_path)
             
-            if not text_content.strip():
+            if not chunks:
                 raise ValueError("No text content extracted from PDF")
             
-            # Chunk the text
-            chunks = self._chunk_text(text_content)
             logger.info(f"Created {len(chunks)} chunks from PDF")
             
             # Create document chunks
@@ -90,22 +182,20 @@ class PDFIngester(DataIngester):
             product_version = filters.get("product_version")
             tags = filters.get("tags", [])
             
+            # Every chunk of the file shares one doc_id and one validated metadata object
+            doc_id = uuid.uuid4().hex
+            metadata = DocumentMetadata(
+                doc_id=doc_id,
+                title=title,
+                source_type=DocumentSource.PDF,
+                product_version=product_version,
+                tags=tags,
+                metadata={"file_path": file_path}
+            )
+            
             for i, chunk_text in enumerate(chunks):
-                doc_id = str(uuid.uuid4())
-                metadata = DocumentMetadata(
-                    doc_id=doc_id,
-                    title=title,
-                    source_type=DocumentSource.PDF,
-                    product_version=product_version,
-                    tags=tags,
-                    metadata={
-                        "section": f"Page section {i+1}",
-                        "file_path": file_path
-                    }
-                )
-                
-                chunk = DocumentChunk(
-                    chunk_id=str(uuid.uuid4()),
+                chunk = DocumentChunk.model_construct(
+                    chunk_id=f"{doc_id}_{i}",
                     doc_id=doc_id,
                     content=chunk_text,
                     metadata=metadata,
@@ -114,50 +204,19 @@ class PDFIngester(DataIngester):
                 document_chunks.append(chunk)
             
             # Clean up temporary file
-            try:
-                os.unlink(file_path)
-                logger.info(f"Cleaned up temporary file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary file {file_path}: {e}")
+            self._release_input(file_path, filters)
             
             return document_chunks
             
         except Exception as e:
             logger.error(f"Error ingesting PDF {file_path}: {e}")
             # Clean up on error
-            try:
-                os.unlink(file_path)
-            except:
-                pass
+            self._release_input(file_path, filters)
             raise
-    
-    def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into smaller pieces."""
-        # Simple sentence-based chunking
-        sentences = re.split(r'[.!?]+', text)
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-            
-            if len(current_chunk) + len(sentence) < settings.chunk_size:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
 
 
 class DocxIngester(DataIngester):
-    """Word document ingester using unstructured library for better extraction."""
+    """Word document ingester using python-docx, with unstructured for high-fidelity parsing."""
     
     async def ingest(self, filters: Optional[Dict[str, Any]] = None) -> List[DocumentChunk]:
         """Ingest Word documents."""
@@ -168,33 +227,24 @@ class DocxIngester(DataIngester):
         try:
             logger.info(f"Starting DOCX ingestion for: {file_path}")
             
-            # Try unstructured first for better text extraction
-            if UNSTRUCTURED_AVAILABLE:
+            # Native extraction is much faster; unstructured's layout models are opt-in
+            if filters.get("high_fidelity") and UNSTRUCTURED_AVAILABLE:
                 try:
-                    elements = partition_docx(filename=file_path)
-                    text_content = "\n\n".join([str(element) for element in elements])
+                    elements = await self._run(partition_docx, filename=file_path)
+                    text_content = "\n\n".join(map(str, elements))
                     logger.info(f"Extracted {len(text_content)} characters using unstructured")
+                    chunks = pack_paragraphs(text_content, settings.chunk_size)
                 except Exception as e:
                     logger.warning(f"Unstructured failed, falling back to python-docx: {e}")
                     # Fallback to python-docx
-                    doc = Document(file_path)
-                    text_content = ""
-                    for paragraph in doc.paragraphs:
-                        text_content += paragraph.text + "\n"
-                    logger.info(f"Extracted {len(text_content)} characters using python-docx")
+                    chunks = await self._run_cpu(_docx_chunks, file_path)
             else:
                 # Use python-docx directly
-                doc = Document(file_path)
-                text_content = ""
-                for paragraph in doc.paragraphs:
-                    text_content += paragraph.text + "\n"
-                logger.info(f"Extracted {len(text_content)} characters using python-docx")
+                chunks = await self._run_cpu(_docx_chunks, file_path)
             
-            if not text_content.strip():
+            if not chunks:
                 raise ValueError("No text content extracted from DOCX")
             
-            # Chunk the text
-            chunks = self._chunk_text(text_content)
             logger.info(f"Created {len(chunks)} chunks from DOCX")
             
             # Create document chunks
@@ -203,22 +253,19 @@ class DocxIngester(DataIngester):
             product_version = filters.get("product_version")
             tags = filters.get("tags", [])
             
+            doc_id = uuid.uuid4().hex
+            metadata = DocumentMetadata(
+                doc_id=doc_id,
+                title=title,
+                source_type=DocumentSource.DOCX,
+                product_version=product_version,
+                tags=tags,
+                metadata={"file_path": file_path}
+            )
+            
             for i, chunk_text in enumerate(chunks):
-                doc_id = str(uuid.uuid4())
-                metadata = DocumentMetadata(
-                    doc_id=doc_id,
-                    title=title,
-                    source_type=DocumentSource.DOCX,
-                    product_version=product_version,
-                    tags=tags,
-                    metadata={
-                        "section": f"Section {i+1}",
-                        "file_path": file_path
-                    }
-                )
-                
-                chunk = DocumentChunk(
-                    chunk_id=str(uuid.uuid4()),
+                chunk = DocumentChunk.model_construct(
+                    chunk_id=f"{doc_id}_{i}",
                     doc_id=doc_id,
                     content=chunk_text,
                     metadata=metadata,
@@ -227,46 +274,15 @@ class DocxIngester(DataIngester):
                 document_chunks.append(chunk)
             
             # Clean up temporary file
-            try:
-                os.unlink(file_path)
-                logger.info(f"Cleaned up temporary file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary file {file_path}: {e}")
+            self._release_input(file_path, filters)
             
             return document_chunks
             
         except Exception as e:
             logger.error(f"Error ingesting DOCX {file_path}: {e}")
             # Clean up on error
-            try:
-                os.unlink(file_path)
-            except:
-                pass
+            self._release_input(file_path, filters)
             raise
-    
-    def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into smaller pieces."""
-        # Simple paragraph-based chunking
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
-        
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            
-            if len(current_chunk) + len(paragraph) < settings.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
 
 
 class TextIngester(DataIngester):
@@ -282,14 +298,13 @@ class TextIngester(DataIngester):
             logger.info(f"Starting text file ingestion for: {file_path}")
             
             # Read the text file
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                text_content = await f.read()
+            text_content = await self._run(Path(file_path).read_text, encoding='utf-8')
             
             if not text_content.strip():
                 raise ValueError("No text content found in file")
             
             # Chunk the text
-            chunks = self._chunk_text(text_content)
+            chunks = pack_paragraphs(text_content, settings.chunk_size)
             logger.info(f"Created {len(chunks)} chunks from text file")
             
             # Create document chunks
@@ -298,22 +313,19 @@ class TextIngester(DataIngester):
             product_version = filters.get("product_version")
             tags = filters.get("tags", [])
             
+            doc_id = uuid.uuid4().hex
+            metadata = DocumentMetadata(
+                doc_id=doc_id,
+                title=title,
+                source_type=DocumentSource.TEXT,
+                product_version=product_version,
+                tags=tags,
+                metadata={"file_path": file_path}
+            )
+            
             for i, chunk_text in enumerate(chunks):
-                doc_id = str(uuid.uuid4())
-                metadata = DocumentMetadata(
-                    doc_id=doc_id,
-                    title=title,
-                    source_type=DocumentSource.TEXT,
-                    product_version=product_version,
-                    tags=tags,
-                    metadata={
-                        "section": f"Section {i+1}",
-                        "file_path": file_path
-                    }
-                )
-                
-                chunk = DocumentChunk(
-                    chunk_id=str(uuid.uuid4()),
+                chunk = DocumentChunk.model_construct(
+                    chunk_id=f"{doc_id}_{i}",
                     doc_id=doc_id,
                     content=chunk_text,
                     metadata=metadata,
@@ -322,46 +334,15 @@ class TextIngester(DataIngester):
                 document_chunks.append(chunk)
             
             # Clean up temporary file
-            try:
-                os.unlink(file_path)
-                logger.info(f"Cleaned up temporary file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary file {file_path}: {e}")
+            self._release_input(file_path, filters)
             
             return document_chunks
             
         except Exception as e:
             logger.error(f"Error ingesting text file {file_path}: {e}")
             # Clean up on error
-            try:
-                os.unlink(file_path)
-            except:
-                pass
+            self._release_input(file_path, filters)
             raise
-    
-    def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into smaller pieces."""
-        # Simple paragraph-based chunking
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
-        
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            
-            if len(current_chunk) + len(paragraph) < settings.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
 
 
 class MarkdownIngester(DataIngester):
@@ -376,29 +357,27 @@ class MarkdownIngester(DataIngester):
         try:
             logger.info(f"Starting markdown ingestion for: {file_path}")
             
-            # Try unstructured first for better markdown processing
-            if UNSTRUCTURED_AVAILABLE:
+            # Native extraction is much faster; unstructured's layout models are opt-in
+            if filters.get("high_fidelity") and UNSTRUCTURED_AVAILABLE:
                 try:
-                    elements = partition_md(filename=file_path)
-                    text_content = "\n\n".join([str(element) for element in elements])
+                    elements = await self._run(partition_md, filename=file_path)
+                    text_content = "\n\n".join(map(str, elements))
                     logger.info(f"Extracted {len(text_content)} characters using unstructured")
                 except Exception as e:
                     logger.warning(f"Unstructured failed, falling back to raw text: {e}")
                     # Fallback to raw text reading
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                        text_content = await f.read()
+                    text_content = await self._run(Path(file_path).read_text, encoding='utf-8')
                     logger.info(f"Extracted {len(text_content)} characters as raw text")
             else:
                 # Read as raw text directly
-                async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                    text_content = await f.read()
+                text_content = await self._run(Path(file_path).read_text, encoding='utf-8')
                 logger.info(f"Extracted {len(text_content)} characters as raw text")
             
             if not text_content.strip():
                 raise ValueError("No text content extracted from markdown")
             
             # Chunk the text
-            chunks = self._chunk_text(text_content)
+            chunks = pack_markdown(text_content, settings.chunk_size)
             logger.info(f"Created {len(chunks)} chunks from markdown")
             
             # Create document chunks
@@ -407,22 +386,19 @@ class MarkdownIngester(DataIngester):
             product_version = filters.get("product_version")
             tags = filters.get("tags", [])
             
+            doc_id = uuid.uuid4().hex
+            metadata = DocumentMetadata(
+                doc_id=doc_id,
+                title=title,
+                source_type=DocumentSource.MARKDOWN,
+                product_version=product_version,
+                tags=tags,
+                metadata={"file_path": file_path}
+            )
+            
             for i, chunk_text in enumerate(chunks):
-                doc_id = str(uuid.uuid4())
-                metadata = DocumentMetadata(
-                    doc_id=doc_id,
-                    title=title,
-                    source_type=DocumentSource.MARKDOWN,
-                    product_version=product_version,
-                    tags=tags,
-                    metadata={
-                        "section": f"Section {i+1}",
-                        "file_path": file_path
-                    }
-                )
-                
-                chunk = DocumentChunk(
-                    chunk_id=str(uuid.uuid4()),
+                chunk = DocumentChunk.model_construct(
+                    chunk_id=f"{doc_id}_{i}",
                     doc_id=doc_id,
                     content=chunk_text,
                     metadata=metadata,
@@ -431,74 +407,22 @@ class MarkdownIngester(DataIngester):
                 document_chunks.append(chunk)
             
             # Clean up temporary file
-            try:
-                os.unlink(file_path)
-                logger.info(f"Cleaned up temporary file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary file {file_path}: {e}")
+            self._release_input(file_path, filters)
             
             return document_chunks
             
         except Exception as e:
             logger.error(f"Error ingesting markdown {file_path}: {e}")
             # Clean up on error
-            try:
-                os.unlink(file_path)
-            except:
-                pass
+            self._release_input(file_path, filters)
             raise
-    
-    def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into smaller pieces for markdown."""
-        # Try to chunk by headers first, then fall back to paragraphs
-        header_chunks = re.split(r'\n(?=#{1,6}\s)', text)
-        
-        if len(header_chunks) > 1:
-            # We have headers, use them for chunking
-            chunks = []
-            for header_chunk in header_chunks:
-                header_chunk = header_chunk.strip()
-                if not header_chunk:
-                    continue
-                
-                if len(header_chunk) <= settings.chunk_size:
-                    chunks.append(header_chunk)
-                else:
-                    # Split large header sections by paragraphs
-                    para_chunks = self._chunk_by_paragraphs(header_chunk)
-                    chunks.extend(para_chunks)
-            return chunks
-        else:
-            # No headers found, use paragraph-based chunking
-            return self._chunk_by_paragraphs(text)
-    
-    def _chunk_by_paragraphs(self, text: str) -> List[str]:
-        """Chunk text by paragraphs."""
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
-        
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            
-            if len(current_chunk) + len(paragraph) < settings.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
 
 
 class ZendeskIngester(DataIngester):
     """Zendesk ticket ingester."""
     
+    page_size = 100  # Zendesk's maximum tickets per page
+    
     def __init__(self):
         self.zenpy_client = None
     
@@ -511,100 +435,104 @@ class ZendeskIngester(DataIngester):
             self.zenpy_client = Zenpy(
                 subdomain=settings.zendesk_subdomain,
                 email=settings.zendesk_email,
-                token=settings.zendesk_token
+                token=settings.zendesk_token,
+                session=_mount_pooled_adapter(requests.Session())
             )
         return self.zenpy_client
     
     async def ingest(self, filters: Optional[Dict[str, Any]] = None) -> List[DocumentChunk]:
         """Ingest Zendesk tickets."""
+        return [chunk async for chunk in self.iter_chunks(filters)]
+    
+    async def iter_chunks(self, filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[DocumentChunk]:
+        """Stream chunks from Zendesk tickets one page at a time."""
+        filters = filters or {}
         try:
-            chunks = []
+            ticket_count = 0
+            chunk_count = 0
             
-            # Get tickets (limit for demo purposes)
+            # Get tickets (limit for demo purposes); Zenpy paginates lazily as we iterate
             zenpy_client = self._get_zenpy_client()
-            tickets = list(zenpy_client.tickets(limit=filters.get("limit", 100)))
-            
-            for ticket in tickets:
-                # Create metadata
-                metadata = DocumentMetadata(
-                    doc_id=f"zendesk_ticket_{ticket.id}",
-                    title=f"Zendesk Ticket #{ticket.id}: {ticket.subject}",
-                    source_type=DocumentSource.ZENDESK,
-                    product_version=filters.get("product_version"),
-                    tags=ticket.tags if hasattr(ticket, 'tags') else [],
-                    metadata={
-                        "ticket_id": str(ticket.id),
-                        "status": ticket.status,
-                        "priority": ticket.priority,
-                        "requester_id": ticket.requester_id,
-                        "assignee_id": ticket.assignee_id,
-                        "created_at": ticket.created_at.isoformat() if ticket.created_at else None,
-                        "updated_at": ticket.updated_at.isoformat() if ticket.updated_at else None,
-                    }
-                )
-                
-                # Combine ticket content
-                content_parts = [
-                    f"Subject: {ticket.subject}",
-                    f"Description: {ticket.description or 'No description'}"
-                ]
-                
-                # Add comments
-                comments = list(self.zenpy_client.tickets.comments(ticket.id))
-                for comment in comments[:5]:  # Limit comments for chunking
-                    if comment.body:
-                        content_parts.append(f"Comment: {comment.body}")
-                
-                full_content = "\n\n".join(content_parts)
+            tickets = iter(zenpy_client.tickets(limit=filters.get("limit", 100)))
+            semaphore = asyncio.Semaphore(settings.zendesk_concurrency)
+            
+            async def fetch_comments(ticket_id) -> List[Any]:
+                async with semaphore:
+                    return await self._run(lambda: list(zenpy_client.tickets.comments(ticket_id)))
+            
+            while True:
+                page = await self._run(lambda: list(islice(tickets, self.page_size)))
+                if not page:
+                    break
                 
-                # Chunk the content
-                text_chunks = self._chunk_text(full_content)
+                # One comments request per ticket, fanned out across the page
+                page_comments = await asyncio.gather(*(fetch_comments(ticket.id) for ticket in page))
                 
-                # Create DocumentChunk objects
-                for i, chunk_text in enumerate(text_chunks):
-                    chunk = DocumentChunk(
-                        chunk_id=str(uuid.uuid4()),
-                        doc_id=metadata.doc_id,
-                        content=chunk_text.strip(),
-                        metadata=metadata,
-                        chunk_index=i
-                    )
-                    chunks.append(chunk)
-            
-            logger.info(f"Ingested {len(tickets)} Zendesk tickets, created {len(chunks)} chunks")
-            return chunks
+                for ticket, comments in zip(page, page_comments):
+                    for chunk in self._ticket_to_chunks(ticket, comments, filters):
+                        chunk_count += 1
+                        yield chunk
+                    ticket_count += 1
+            
+            logger.info(f"Ingested {ticket_count} Zendesk tickets, created {chunk_count} chunks")
             
         except Exception as e:
             logger.error(f"Error ingesting Zendesk tickets: {e}")
             raise
     
-    def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into smaller pieces."""
-        if len(text) <= settings.chunk_size:
-            return [text]
+    def _ticket_to_chunks(self, ticket, comments: List[Any], filters: Dict[str, Any]) -> List[DocumentChunk]:
+        """Build document chunks for a single ticket and its comments."""
+        # Create metadata
+        metadata = DocumentMetadata(
+            doc_id=f"zendesk_ticket_{ticket.id}",
+            title=f"Zendesk Ticket #{ticket.id}: {ticket.subject}",
+            source_type=DocumentSource.ZENDESK,
+            product_version=filters.get("product_version"),
+            tags=ticket.tags if hasattr(ticket, 'tags') else [],
+            metadata={
+                "ticket_id": str(ticket.id),
+                "status": ticket.status,
+                "priority": ticket.priority,
+                "requester_id": ticket.requester_id,
+                "assignee_id": ticket.assignee_id,
+                "created_at": ticket.created_at.isoformat() if ticket.created_at else None,
+                "updated_at": ticket.updated_at.isoformat() if ticket.updated_at else None,
+            }
+        )
         
-        # Split by sections (Subject, Description, Comments)
-        sections = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
+        # Combine ticket content
+        content_parts = [
+            f"Subject: {ticket.subject}",
+            f"Description: {ticket.description or 'No description'}"
+        ]
         
-        for section in sections:
-            if len(current_chunk) + len(section) < settings.chunk_size:
-                current_chunk += section + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = section + "\n\n"
+        # Add comments
+        for comment in comments[:5]:  # Limit comments for chunking
+            if comment.body:
+                content_parts.append(f"Comment: {comment.body}")
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        full_content = "\n\n".join(content_parts)
         
-        return chunks
+        # Chunk the content and create DocumentChunk objects
+        return [
+            DocumentChunk.model_construct(
+                chunk_id=f"{metadata.doc_id}_{i}",
+                doc_id=metadata.doc_id,
+                content=chunk_text.strip(),
+                metadata=metadata,
+                chunk_index=i
+            )
+            for i, chunk_text in enumerate(pack_paragraphs(full_content, settings.chunk_size))
+        ]
 
 
 class JiraIngester(DataIngester):
     """Jira ticket ingester."""
     
+    page_size = 50  # Jira's default maxResults per search request
+    # Only the fields _issue_to_chunks reads; comments come back inline with the "comment" field
+    fields = "summary,description,comment,issuetype,status,priority,assignee,reporter,created,updated"
+    
     def __init__(self):
         self.jira_client = None
     
@@ -618,103 +546,107 @@ class JiraIngester(DataIngester):
                 server=settings.jira_server,
                 basic_auth=(settings.jira_email, settings.jira_api_token)
             )
+            _mount_pooled_adapter(self.jira_client._session)
         return self.jira_client
     
     async def ingest(self, filters: Optional[Dict[str, Any]] = None) -> List[DocumentChunk]:
         """Ingest Jira tickets."""
+        return [chunk async for chunk in self.iter_chunks(filters)]
+    
+    async def iter_chunks(self, filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[DocumentChunk]:
+        """Stream chunks from Jira issues one search page at a time."""
+        filters = filters or {}
         try:
-            chunks = []
+            issue_count = 0
+            chunk_count = 0
             
             # Build JQL query
             jql = filters.get("jql", "project is not EMPTY")
             max_results = filters.get("limit", 100)
             
-            # Search issues
+            # Search issues page by page
             jira_client = self._get_jira_client()
-            issues = jira_client.search_issues(jql, maxResults=max_results, expand='comments')
-            
-            for issue in issues:
-                # Create metadata
-                metadata = DocumentMetadata(
-                    doc_id=f"jira_issue_{issue.key}",
-                    title=f"Jira Issue {issue.key}: {issue.fields.summary}",
-                    source_type=DocumentSource.JIRA,
-                    product_version=filters.get("product_version"),
-                    tags=[issue.fields.issuetype.name] if hasattr(issue.fields, 'issuetype') else [],
-                    metadata={
-                        "ticket_id": issue.key,
-                        "issue_type": issue.fields.issuetype.name if hasattr(issue.fields, 'issuetype') else None,
-                        "status": issue.fields.status.name if hasattr(issue.fields, 'status') else None,
-                        "priority": issue.fields.priority.name if hasattr(issue.fields, 'priority') else None,
-                        "assignee": issue.fields.assignee.displayName if hasattr(issue.fields, 'assignee') and issue.fields.assignee else None,
-                        "reporter": issue.fields.reporter.displayName if hasattr(issue.fields, 'reporter') else None,
-                        "created_at": issue.fields.created,
-                        "updated_at": issue.fields.updated,
-                    }
+            while issue_count < max_results:
+                issues = await self._run(
+                    jira_client.search_issues,
+                    jql,
+                    startAt=issue_count,
+                    maxResults=min(self.page_size, max_results - issue_count),
+                    fields=self.fields
                 )
+                if not issues:
+                    break
                 
-                # Combine issue content
-                content_parts = [
-                    f"Summary: {issue.fields.summary}",
-                    f"Description: {issue.fields.description or 'No description'}"
-                ]
-                
-                # Add comments
-                if hasattr(issue.fields, 'comment') and issue.fields.comment.comments:
-                    for comment in issue.fields.comment.comments[:5]:  # Limit comments
-                        content_parts.append(f"Comment: {comment.body}")
-                
-                full_content = "\n\n".join(content_parts)
-                
-                # Chunk the content
-                text_chunks = self._chunk_text(full_content)
+                for issue in issues:
+                    for chunk in self._issue_to_chunks(issue, filters):
+                        chunk_count += 1
+                        yield chunk
+                issue_count += len(issues)
                 
-                # Create DocumentChunk objects
-                for i, chunk_text in enumerate(text_chunks):
-                    chunk = DocumentChunk(
-                        chunk_id=str(uuid.uuid4()),
-                        doc_id=metadata.doc_id,
-                        content=chunk_text.strip(),
-                        metadata=metadata,
-                        chunk_index=i
-                    )
-                    chunks.append(chunk)
-            
-            logger.info(f"Ingested {len(issues)} Jira issues, created {len(chunks)} chunks")
-            return chunks
+                if len(issues) < self.page_size:
+                    break
+            
+            logger.info(f"Ingested {issue_count} Jira issues, created {chunk_count} chunks")
             
         except Exception as e:
             logger.error(f"Error ingesting Jira issues: {e}")
             raise
     
-    def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into smaller pieces."""
-        if len(text) <= settings.chunk_size:
-            return [text]
+    def _issue_to_chunks(self, issue, filters: Dict[str, Any]) -> List[DocumentChunk]:
+        """Build document chunks for a single issue and its comments."""
+        # Create metadata
+        metadata = DocumentMetadata(
+            doc_id=f"jira_issue_{issue.key}",
+            title=f"Jira Issue {issue.key}: {issue.fields.summary}",
+            source_type=DocumentSource.JIRA,
+            product_version=filters.get("product_version"),
+            tags=[issue.fields.issuetype.name] if hasattr(issue.fields, 'issuetype') else [],
+            metadata={
+                "ticket_id": issue.key,
+                "issue_type": issue.fields.issuetype.name if hasattr(issue.fields, 'issuetype') else None,
+                "status": issue.fields.status.name if hasattr(issue.fields, 'status') else None,
+                "priority": issue.fields.priority.name if hasattr(issue.fields, 'priority') else None,
+                "assignee": issue.fields.assignee.displayName if hasattr(issue.fields, 'assignee') and issue.fields.assignee else None,
+                "reporter": issue.fields.reporter.displayName if hasattr(issue.fields, 'reporter') else None,
+                "created_at": issue.fields.created,
+                "updated_at": issue.fields.updated,
+            }
+        )
         
-        # Split by sections (Summary, Description, Comments)
-        sections = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
+        # Combine issue content
+        content_parts = [
+            f"Summary: {issue.fields.summary}",
+            f"Description: {issue.fields.description or 'No description'}"
+        ]
         
-        for section in sections:
-            if len(current_chunk) + len(section) < settings.chunk_size:
-                current_chunk += section + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = section + "\n\n"
+        # Add comments
+        if hasattr(issue.fields, 'comment') and issue.fields.comment.comments:
+            for comment in issue.fields.comment.comments[:5]:  # Limit comments
+                content_parts.append(f"Comment: {comment.body}")
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        full_content = "\n\n".join(content_parts)
         
-        return chunks
+        # Chunk the content and create DocumentChunk objects
+        return [
+            DocumentChunk.model_construct(
+                chunk_id=f"{metadata.doc_id}_{i}",
+                doc_id=metadata.doc_id,
+                content=chunk_text.strip(),
+                metadata=metadata,
+                chunk_index=i
+            )
+            for i, chunk_text in enumerate(pack_paragraphs(full_content, settings.chunk_size))
+        ]
 
 
 class IngestionService:
     """Main ingestion service that coordinates different ingesters."""
     
     def __init__(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.ingest_threads,
+            thread_name_prefix="ingest"
+        )
         self.ingesters = {
             DocumentSource.PDF: PDFIngester(),
             DocumentSource.DOCX: DocxIngester(),
@@ -732,6 +664,9 @@ class IngestionService:
             self.ingesters[DocumentSource.JIRA] = JiraIngester()
         except ValueError:
             logger.warning("Jira ingester not initialized - missing credentials")
+        
+        for ingester in self.ingesters.values():
+            ingester.executor = self.executor
     
     async def ingest_documents(
         self, 
@@ -745,23 +680,42 @@ class IngestionService:
         ingester = self.ingesters[source_type]
         return await ingester.ingest(filters)
     
+    def iter_documents(
+        self, 
+        source_type: DocumentSource, 
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[DocumentChunk]:
+        """Stream document chunks from a specific source as they are produced."""
+        if source_type not in self.ingesters:
+            raise ValueError(f"Ingester for {source_type} not available")
+        
+        return self.ingesters[source_type].iter_chunks(filters)
+    
     async def ingest_multiple_sources(
         self, 
         sources: List[Dict[str, Any]]
     ) -> List[DocumentChunk]:
-        """Ingest from multiple sources."""
-        all_chunks = []
+        """Ingest from multiple sources concurrently."""
+        semaphore = asyncio.Semaphore(settings.max_concurrent_ingests)
+        
+        async def ingest_one(source_config: Dict[str, Any]) -> List[DocumentChunk]:
+            async with semaphore:
+                source_type = DocumentSource(source_config["source_type"])
+                filters = source_config.get("filters", {})
+                return await self.ingest_documents(source_type, filters)
         
-        for source_config in sources:
-            source_type = DocumentSource(source_config["source_type"])
-            filters = source_config.get("filters", {})
-            
-            try:
-                chunks = await self.ingest_documents(source_type, filters)
-                all_chunks.extend(chunks)
-            except Exception as e:
-                logger.error(f"Error ingesting from {source_type}: {e}")
+        results = await asyncio.gather(
+            *(ingest_one(source_config) for source_config in sources),
+            return_exceptions=True
+        )
+        
+        all_chunks = []
+        for source_config, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error ingesting from {source_config.get('source_type')}: {result}")
                 # Continue with other sources
+                continue
+            all_chunks.extend(result)
         
         return all_chunks
 
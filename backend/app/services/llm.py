@@ -1,13 +1,39 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-import httpx
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import hashlib
+import numpy as np
 import openai
+import orjson
+import time
 from ..config import settings
 from ..models import DocumentChunk
+from .cache import CacheStore, get_cache_store
+from .embeddings import get_query_embedding
+from .http_client import get_http_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Static instructions go first and retrieved context after them, so providers
+# with prefix caching can reuse the KV cache of the instructions across requests
+_OLLAMA_INSTRUCTIONS = """You are a helpful customer support assistant. Use ONLY the provided context to answer the user's question. 
+
+If the context doesn't contain enough information to answer the question, respond with: "I don't have enough information to answer that question. Please contact our support team for assistance."
+
+"""
+
+_OPENAI_SYSTEM_PROMPT = """You are a helpful customer support assistant. Use ONLY the provided context to answer questions. 
+
+If the context doesn't contain enough information, respond with: "I don't have enough information to answer that question. Please contact our support team for assistance."
+
+Be concise, helpful, and cite the relevant sources in your response."""
+
+
+def _stable_order(chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+    """Order chunks by ID so the same retrieval set always yields byte-identical context."""
+    return sorted(chunks, key=lambda chunk: chunk.chunk_id)
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
@@ -22,19 +48,37 @@ class LLMProvider(ABC):
         """Generate a response using the LLM."""
         pass
     
+    async def stream_response(
+        self, 
+        prompt: str, 
+        context_chunks: List[DocumentChunk],
+        max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream a response as text fragments; the default yields the full response at once."""
+        yield await self.generate_response(prompt, context_chunks, max_tokens)
+    
     @abstractmethod
     async def health_check(self) -> bool:
         """Check if the LLM provider is healthy."""
         pass
+    
+    async def warmup(self) -> None:
+        """Prepare the model for an imminent request; a no-op unless the provider needs it."""
+        pass
 
 
 class OllamaProvider(LLMProvider):
     """Ollama local LLM provider."""
     
+    # Seconds between warmup requests; the model stays loaded for keep_alive anyway
+    warmup_interval = 60.0
+    
     def __init__(self):
         self.base_url = settings.ollama_base_url
         self.model = settings.ollama_model
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.keep_alive = settings.ollama_keep_alive
+        self.client = get_http_client()
+        self._last_warmup = 0.0
     
     async def generate_response(
         self, 
@@ -44,29 +88,14 @@ class OllamaProvider(LLMProvider):
     ) -> str:
         """Generate response using Ollama."""
         try:
-            # Format context from chunks
-            context = self._format_context(context_chunks)
-            
-            # Create the full prompt
-            full_prompt = self._create_prompt(prompt, context)
-            
             # Call Ollama API
             response = await self.client.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": full_prompt,
-                    "stream": False,
-                    "options": {
-                        "num_predict": max_tokens,
-                        "temperature": 0.1,
-                        "top_p": 0.9
-                    }
-                }
+                json=self._request_body(prompt, context_chunks, max_tokens, stream=False)
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 return result.get("response", "").strip()
             else:
                 logger.error(f"Ollama API error: {response.status_code} - {response.text}")
@@ -76,6 +105,74 @@ class OllamaProvider(LLMProvider):
             logger.error(f"Error generating response with Ollama: {e}")
             raise
     
+    async def stream_response(
+        self, 
+        prompt: str, 
+        context_chunks: List[DocumentChunk],
+        max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream response fragments from Ollama as they are generated."""
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/api/generate",
+                json=self._request_body(prompt, context_chunks, max_tokens, stream=True)
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                    raise Exception(f"Ollama API error: {response.status_code}")
+                
+                # Ollama streams one JSON object per line
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = orjson.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        break
+                
+        except Exception as e:
+            logger.error(f"Error streaming response with Ollama: {e}")
+            raise
+    
+    def _request_body(
+        self,
+        prompt: str,
+        context_chunks: List[DocumentChunk],
+        max_tokens: int,
+        stream: bool
+    ) -> Dict[str, Any]:
+        """Build the /api/generate request body."""
+        context = self._format_context(context_chunks)
+        return {
+            "model": self.model,
+            "prompt": self._create_prompt(prompt, context),
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": 0.1,
+                "top_p": 0.9
+            }
+        }
+    
+    async def warmup(self) -> None:
+        """Load the model into memory ahead of a generate call; errors are only logged."""
+        if time.monotonic() - self._last_warmup < self.warmup_interval:
+            return
+        self._last_warmup = time.monotonic()
+        
+        try:
+            # A generate request without a prompt just loads the model and resets its keep-alive
+            await self.client.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive}
+            )
+        except Exception as e:
+            logger.warning(f"Ollama warmup failed: {e}")
+    
     async def health_check(self) -> bool:
         """Check Ollama health."""
         try:
@@ -91,7 +188,7 @@ class OllamaProvider(LLMProvider):
             return "No relevant context found."
         
         context_parts = []
-        for i, chunk in enumerate(chunks, 1):
+        for i, chunk in enumerate(_stable_order(chunks), 1):
             context_parts.append(
                 f"[Source {i}] {chunk.metadata.title}\n{chunk.content}\n"
             )
@@ -100,11 +197,7 @@ class OllamaProvider(LLMProvider):
     
     def _create_prompt(self, query: str, context: str) -> str:
         """Create the full prompt for the LLM."""
-        return f"""You are a helpful customer support assistant. Use ONLY the provided context to answer the user's question. 
-
-If the context doesn't contain enough information to answer the question, respond with: "I don't have enough information to answer that question. Please contact our support team for assistance."
-
-Context:
+        return f"""{_OLLAMA_INSTRUCTIONS}Context:
 {context}
 
 Question: {query}
@@ -119,7 +212,7 @@ class OpenAIProvider(LLMProvider):
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key is required")
         
-        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key, http_client=get_http_client())
         self.model = settings.openai_model
     
     async def generate_response(
@@ -130,29 +223,10 @@ class OpenAIProvider(LLMProvider):
     ) -> str:
         """Generate response using OpenAI."""
         try:
-            # Format context from chunks
-            context = self._format_context(context_chunks)
-            
-            # Create messages for chat completion
-            messages = [
-                {
-                    "role": "system",
-                    "content": """You are a helpful customer support assistant. Use ONLY the provided context to answer questions. 
-                    
-If the context doesn't contain enough information, respond with: "I don't have enough information to answer that question. Please contact our support team for assistance."
-
-Be concise, helpful, and cite the relevant sources in your response."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"Context:\n{context}\n\nQuestion: {prompt}"
-                }
-            ]
-            
             # Call OpenAI API
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=self._create_messages(prompt, context_chunks),
                 max_tokens=max_tokens,
                 temperature=0.1,
                 top_p=0.9
@@ -164,6 +238,43 @@ Be concise, helpful, and cite the relevant sources in your response."""
             logger.error(f"Error generating response with OpenAI: {e}")
             raise
     
+    async def stream_response(
+        self, 
+        prompt: str, 
+        context_chunks: List[DocumentChunk],
+        max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream response fragments from OpenAI as they are generated."""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._create_messages(prompt, context_chunks),
+                max_tokens=max_tokens,
+                temperature=0.1,
+                top_p=0.9,
+                stream=True
+            )
+            
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            logger.error(f"Error streaming response with OpenAI: {e}")
+            raise
+    
+    def _create_messages(self, prompt: str, context_chunks: List[DocumentChunk]) -> List[Dict[str, str]]:
+        """Create chat messages for the completion request."""
+        context = self._format_context(context_chunks)
+        
+        # Static system prompt, then context, then the question, so OpenAI's
+        # automatic prefix caching covers as much of the prompt as possible
+        return [
+            {"role": "system", "content": _OPENAI_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Context:\n{context}"},
+            {"role": "user", "content": f"Question: {prompt}"}
+        ]
+    
     async def health_check(self) -> bool:
         """Check OpenAI health."""
         try:
@@ -180,7 +291,7 @@ Be concise, helpful, and cite the relevant sources in your response."""
             return "No relevant context found."
         
         context_parts = []
-        for i, chunk in enumerate(chunks, 1):
+        for i, chunk in enumerate(_stable_order(chunks), 1):
             source_info = f"{chunk.metadata.title}"
             if chunk.metadata.source_type in ["zendesk", "jira"] and "ticket_id" in chunk.metadata.metadata:
                 source_info += f" (Ticket #{chunk.metadata.metadata['ticket_id']})"
@@ -190,6 +301,123 @@ Be concise, helpful, and cite the relevant sources in your response."""
         return "\n".join(context_parts)
 
 
+class CachedLLMProvider(LLMProvider):
+    """Wraps a provider and reuses answers to repeated questions over the same context.
+    
+    Exact repeats (ignoring case and padding) hit the shared cache store; paraphrases
+    with the same retrieved chunks are matched by query-embedding similarity in-process.
+    """
+    
+    # Paraphrased questions remembered per distinct set of context chunks
+    similar_per_context = 16
+    
+    def __init__(self, provider: LLMProvider, store: CacheStore):
+        self.provider = provider
+        self.store = store
+        # Per context: (query embedding, answer, monotonic expiry) for recent paraphrases
+        self._similar: "OrderedDict[str, List[Tuple[np.ndarray, str, float]]]" = OrderedDict()
+    
+    @staticmethod
+    def _context_key(context_chunks: List[DocumentChunk], max_tokens: int) -> str:
+        """Digest of the retrieved chunks' IDs and content, and the generation length.
+        
+        Chunk IDs are deterministic, so the content is included for re-ingested records
+        whose text changed to get a new key instead of a stale answer.
+        """
+        digest = hashlib.blake2b(str(max_tokens).encode("utf-8"), digest_size=16)
+        for chunk in _stable_order(context_chunks):
+            digest.update(b"\0" + chunk.chunk_id.encode("utf-8") + b"\0" + chunk.content.encode("utf-8"))
+        return digest.hexdigest()
+    
+    async def _lookup(
+        self,
+        prompt: str,
+        context_chunks: List[DocumentChunk],
+        max_tokens: int
+    ) -> Tuple[Optional[str], Tuple[str, str, np.ndarray]]:
+        """Find a cached answer; also returns the keys needed to store a new one."""
+        context_key = self._context_key(context_chunks, max_tokens)
+        query_digest = hashlib.blake2b(prompt.strip().lower().encode("utf-8"), digest_size=16).hexdigest()
+        key = f"llm:{context_key}:{query_digest}"
+        
+        try:
+            cached = await self.store.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            cached = None
+        
+        # The query was just embedded for retrieval, so this is a cache hit in the embedding layer
+        embedding = await get_query_embedding(prompt)
+        embedding = embedding / (np.linalg.norm(embedding) or 1.0)
+        entry = (key, context_key, embedding)
+        if cached is not None:
+            return cached.decode("utf-8"), entry
+        
+        similar = self._similar.get(context_key)
+        if similar:
+            now = time.monotonic()
+            similar[:] = [item for item in similar if item[2] > now]
+            for similar_embedding, answer, _ in similar:
+                if float(np.dot(similar_embedding, embedding)) >= settings.llm_cache_similarity:
+                    self._similar.move_to_end(context_key)
+                    return answer, entry
+        return None, entry
+    
+    async def _remember(self, entry: Tuple[str, str, np.ndarray], response: str) -> None:
+        """Store a freshly generated answer in both cache tiers."""
+        key, context_key, embedding = entry
+        try:
+            await self.store.set(key, response.encode("utf-8"), settings.llm_cache_ttl)
+        except Exception as e:
+            logger.warning(f"LLM cache update failed: {e}")
+        
+        similar = self._similar.setdefault(context_key, [])
+        similar.append((embedding, response, time.monotonic() + settings.llm_cache_ttl))
+        del similar[:-self.similar_per_context]
+        self._similar.move_to_end(context_key)
+        while len(self._similar) > settings.cache_size:
+            self._similar.popitem(last=False)
+    
+    async def generate_response(
+        self, 
+        prompt: str, 
+        context_chunks: List[DocumentChunk],
+        max_tokens: int = 1000
+    ) -> str:
+        """Return a cached answer when possible, otherwise generate and cache one."""
+        answer, entry = await self._lookup(prompt, context_chunks, max_tokens)
+        if answer is None:
+            answer = await self.provider.generate_response(prompt, context_chunks, max_tokens)
+            await self._remember(entry, answer)
+        return answer
+    
+    async def stream_response(
+        self, 
+        prompt: str, 
+        context_chunks: List[DocumentChunk],
+        max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Yield a cached answer whole, otherwise stream a new one and cache it once complete."""
+        answer, entry = await self._lookup(prompt, context_chunks, max_tokens)
+        if answer is not None:
+            yield answer
+            return
+        
+        parts = []
+        async for part in self.provider.stream_response(prompt, context_chunks, max_tokens):
+            parts.append(part)
+            yield part
+        await self._remember(entry, "".join(parts).strip())
+    
+    async def health_check(self) -> bool:
+        """Check the wrapped provider's health."""
+        return await self.provider.health_check()
+    
+    async def warmup(self) -> None:
+        """Warm up the wrapped provider."""
+        await self.provider.warmup()
+
+
 class LLMFactory:
     """Factory for creating LLM providers."""
     
@@ -197,12 +425,23 @@ class LLMFactory:
     def create_provider() -> LLMProvider:
         """Create LLM provider based on configuration."""
         if settings.llm_provider.lower() == "ollama":
-            return OllamaProvider()
+            provider = OllamaProvider()
         elif settings.llm_provider.lower() == "openai":
-            return OpenAIProvider()
+            provider = OpenAIProvider()
         else:
             raise ValueError(f"Unsupported LLM provider: {settings.llm_provider}")
+        
+        if settings.llm_cache_enabled:
+            provider = CachedLLMProvider(provider, get_cache_store())
+        return provider
+
 
+# Global LLM provider instance (lazy initialization)
+_llm_provider = None
 
-# Global LLM provider instance
-llm_provider = LLMFactory.create_provider()
+def get_llm_provider() -> LLMProvider:
+    """Get the global LLM provider instance (lazy initialization)."""
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = LLMFactory.create_provider()
+    return _llm_provider
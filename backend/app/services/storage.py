@@ -0,0 +1,173 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import orjson
+from ..config import settings
+from .cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationStore(ABC):
+    """Abstract base class for conversation history storage."""
+    
+    @abstractmethod
+    async def append(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        """Append a message to a conversation, creating it if needed."""
+        pass
+    
+    @abstractmethod
+    async def get(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a conversation's messages, or None if it doesn't exist."""
+        pass
+    
+    @abstractmethod
+    async def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation; returns whether it existed."""
+        pass
+
+
+class MemoryConversationStore(ConversationStore):
+    """Per-process conversation storage, keeping the last `max_history` messages of each."""
+    
+    def __init__(self, max_history: int):
+        self.max_history = max_history
+        self._conversations: Dict[str, "deque[Dict[str, Any]]"] = {}
+    
+    async def append(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        messages = self._conversations.get(conversation_id)
+        if messages is None:
+            messages = self._conversations[conversation_id] = deque(maxlen=self.max_history)
+        messages.append(message)
+    
+    async def get(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        messages = self._conversations.get(conversation_id)
+        return list(messages) if messages is not None else None
+    
+    async def delete(self, conversation_id: str) -> bool:
+        return self._conversations.pop(conversation_id, None) is not None
+
+
+class RedisConversationStore(ConversationStore):
+    """Conversations as capped Redis lists of JSON messages that expire after inactivity."""
+    
+    def __init__(self, client, ttl: int, max_history: int):
+        self.client = client
+        self.ttl = ttl
+        self.max_history = max_history
+    
+    @staticmethod
+    def _key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}"
+    
+    async def append(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        key = self._key(conversation_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, orjson.dumps(message))
+            pipe.ltrim(key, -self.max_history, -1)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+    
+    async def get(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        messages = await self.client.lrange(self._key(conversation_id), 0, -1)
+        if not messages:
+            return None
+        return [orjson.loads(message) for message in messages]
+    
+    async def delete(self, conversation_id: str) -> bool:
+        return bool(await self.client.delete(self._key(conversation_id)))
+
+
+class FeedbackStore(ABC):
+    """Abstract base class for feedback storage with running aggregates."""
+    
+    @abstractmethod
+    async def add(self, entry: Dict[str, Any]) -> None:
+        """Record a feedback entry."""
+        pass
+    
+    @abstractmethod
+    async def stats(self) -> Tuple[int, float, Dict[int, int]]:
+        """Get the feedback count, rating sum and count per rating."""
+        pass
+
+
+class MemoryFeedbackStore(FeedbackStore):
+    """Per-process feedback storage; aggregates are kept up to date on every add."""
+    
+    # Recent entries kept in memory; aggregates still cover every entry ever added
+    max_entries = 10000
+    
+    def __init__(self):
+        self._entries: "deque[Dict[str, Any]]" = deque(maxlen=self.max_entries)
+        self._count = 0
+        self._rating_sum = 0.0
+        self._histogram: Dict[int, int] = {}
+    
+    async def add(self, entry: Dict[str, Any]) -> None:
+        self._entries.append(entry)
+        self._count += 1
+        self._rating_sum += entry["rating"]
+        self._histogram[entry["rating"]] = self._histogram.get(entry["rating"], 0) + 1
+    
+    async def stats(self) -> Tuple[int, float, Dict[int, int]]:
+        return self._count, self._rating_sum, dict(self._histogram)
+
+
+class RedisFeedbackStore(FeedbackStore):
+    """Feedback entries in a Redis stream, with aggregates kept in hashes."""
+    
+    stream_key = "feedback"
+    histogram_key = "feedback:hist"
+    aggregate_key = "feedback:agg"
+    
+    def __init__(self, client):
+        self.client = client
+    
+    async def add(self, entry: Dict[str, Any]) -> None:
+        fields = {k: "" if v is None else str(v) for k, v in entry.items()}
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.xadd(self.stream_key, fields)
+            pipe.hincrby(self.histogram_key, str(entry["rating"]), 1)
+            pipe.hincrby(self.aggregate_key, "count", 1)
+            pipe.hincrbyfloat(self.aggregate_key, "sum", entry["rating"])
+            await pipe.execute()
+    
+    async def stats(self) -> Tuple[int, float, Dict[int, int]]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self.aggregate_key)
+            pipe.hgetall(self.histogram_key)
+            aggregate, histogram = await pipe.execute()
+        return (
+            int(aggregate.get(b"count", 0)),
+            float(aggregate.get(b"sum", 0)),
+            {int(rating): int(count) for rating, count in histogram.items()}
+        )
+
+
+# Global store instances (lazy initialization), backed by Redis when configured
+_conversation_store = None
+_feedback_store = None
+
+def get_conversation_store() -> ConversationStore:
+    """Get the global conversation store instance."""
+    global _conversation_store
+    if _conversation_store is None:
+        client = get_redis()
+        if client is not None:
+            _conversation_store = RedisConversationStore(
+                client, settings.conversation_ttl, settings.max_history
+            )
+        else:
+            _conversation_store = MemoryConversationStore(settings.max_history)
+    return _conversation_store
+
+
+def get_feedback_store() -> FeedbackStore:
+    """Get the global feedback store instance."""
+    global _feedback_store
+    if _feedback_store is None:
+        client = get_redis()
+        _feedback_store = RedisFeedbackStore(client) if client is not None else MemoryFeedbackStore()
+    return _feedback_store
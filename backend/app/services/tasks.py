@@ -0,0 +1,136 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+import logging
+from ..config import settings
+from .cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStore(ABC):
+    """Status of background ingestion tasks, so clients can poll them.
+    
+    Updates are best-effort: a failure is logged and never fails the task itself.
+    """
+    
+    @abstractmethod
+    async def _update(self, task_id: str, fields: Dict[str, str]) -> None:
+        """Set status fields on a task, creating it if needed."""
+        pass
+    
+    @abstractmethod
+    async def _advance(self, task_id: str, count: int) -> None:
+        """Add to a task's count of processed chunks."""
+        pass
+    
+    @abstractmethod
+    async def _get(self, task_id: str) -> Optional[Dict[str, str]]:
+        """Get a task's raw status fields, or None if it is unknown or expired."""
+        pass
+    
+    async def update(self, task_id: str, status: str, error: Optional[str] = None) -> None:
+        """Record a task's status (pending, running, completed or failed)."""
+        fields = {"status": status, "updated_at": datetime.utcnow().isoformat()}
+        if error is not None:
+            fields["error"] = error
+        try:
+            await self._update(task_id, fields)
+        except Exception as e:
+            logger.warning(f"Failed to update status of task {task_id}: {e}")
+    
+    async def advance(self, task_id: str, count: int) -> None:
+        """Record that another `count` chunks of a task have been stored."""
+        try:
+            await self._advance(task_id, count)
+        except Exception as e:
+            logger.warning(f"Failed to update progress of task {task_id}: {e}")
+    
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a task's status, or None if it is unknown or expired."""
+        fields = await self._get(task_id)
+        if fields is None:
+            return None
+        return {
+            "task_id": task_id,
+            "status": fields.get("status", "pending"),
+            "progress": int(fields.get("progress", 0)),
+            "error": fields.get("error"),
+            "updated_at": fields.get("updated_at")
+        }
+
+
+class MemoryTaskStore(TaskStore):
+    """Per-process task status; only the most recent tasks are kept."""
+    
+    max_tasks = 1000
+    
+    def __init__(self):
+        self._tasks: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+    
+    def _fields(self, task_id: str) -> Dict[str, str]:
+        fields = self._tasks.get(task_id)
+        if fields is None:
+            fields = self._tasks[task_id] = {}
+            while len(self._tasks) > self.max_tasks:
+                self._tasks.popitem(last=False)
+        return fields
+    
+    async def _update(self, task_id: str, fields: Dict[str, str]) -> None:
+        self._fields(task_id).update(fields)
+    
+    async def _advance(self, task_id: str, count: int) -> None:
+        fields = self._fields(task_id)
+        fields["progress"] = str(int(fields.get("progress", 0)) + count)
+    
+    async def _get(self, task_id: str) -> Optional[Dict[str, str]]:
+        fields = self._tasks.get(task_id)
+        return dict(fields) if fields is not None else None
+
+
+class RedisTaskStore(TaskStore):
+    """Task status as Redis hashes shared by all API workers; tasks expire after inactivity."""
+    
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+    
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+    
+    async def _update(self, task_id: str, fields: Dict[str, str]) -> None:
+        key = self._key(task_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+    
+    async def _advance(self, task_id: str, count: int) -> None:
+        key = self._key(task_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hincrby(key, "progress", count)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+    
+    async def _get(self, task_id: str) -> Optional[Dict[str, str]]:
+        fields = await self.client.hgetall(self._key(task_id))
+        if not fields:
+            return None
+        return {k.decode(): v.decode() for k, v in fields.items()}
+
+
+# Global task store instance (lazy initialization), backed by Redis when configured
+_task_store = None
+
+def get_task_store() -> TaskStore:
+    """Get the global task store instance."""
+    global _task_store
+    if _task_store is None:
+        client = get_redis()
+        if client is not None:
+            _task_store = RedisTaskStore(client, settings.task_status_ttl)
+        else:
+            _task_store = MemoryTaskStore()
+    return _task_store
@@ -1,16 +1,45 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterable, Awaitable, Callable, List, Dict, Any, Optional, Tuple
 import pinecone
 import weaviate
+from weaviate.util import generate_uuid5
+from datetime import datetime
+from functools import lru_cache
+import asyncio
 import uuid
-import json
+import orjson
 from ..config import settings
-from ..models import DocumentChunk, Source
-from .embeddings import embedding_provider
+from ..models import DocumentChunk, DocumentMetadata, DocumentSource, Source
+from .cache import get_response_cache
+from .document_index import get_document_index
+from .embeddings import get_embedding_provider, get_query_embedding
 import logging
 
 logger = logging.getLogger(__name__)
 
+# In-flight Pinecone upsert requests per upsert_chunks call
+_PINECONE_UPSERT_CONCURRENCY = 8
+
+# Pinecone metadata keys that map to DocumentChunk/DocumentMetadata fields; the rest is custom metadata
+_RESERVED_METADATA_KEYS = frozenset({
+    "doc_id", "content", "title", "source_type", "chunk_index", "created_at", "product_version", "tags"
+})
+
+
+def _stored_tags(tags: Any) -> List[str]:
+    """Read Pinecone tags, stored as a string list (or comma-joined by older versions)."""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        return tags.split(",")
+    return list(tags)
+
+
+@lru_cache(maxsize=None)
+def _source_type(value: str) -> DocumentSource:
+    """Look up a DocumentSource by its stored value."""
+    return DocumentSource(value)
+
 
 class VectorStore(ABC):
     """Abstract base class for vector stores."""
@@ -54,6 +83,100 @@ class VectorStore(ABC):
     async def delete_document(self, doc_id: str) -> bool:
         """Delete a document and all its chunks."""
         pass
+    
+    async def upsert_stream(
+        self,
+        chunks: AsyncIterable[DocumentChunk],
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        batch_size: Optional[int] = None
+    ) -> int:
+        """Upsert chunks as they are produced, in fixed-size batches; returns how many were upserted.
+        
+        Up to `max_concurrent_upserts` batches are written while the next one is being
+        produced, and no more than that are held in memory at once. `on_progress` is
+        awaited with the size of each batch once it has been written. `batch_size`
+        defaults to `upsert_batch_size`.
+        """
+        batch_size = batch_size or settings.upsert_batch_size
+        semaphore = asyncio.Semaphore(settings.max_concurrent_upserts)
+        tasks: List[asyncio.Task] = []
+        
+        async def write(batch: List[DocumentChunk]) -> None:
+            try:
+                await self.upsert_chunks(batch)
+                if on_progress is not None:
+                    await on_progress(len(batch))
+            finally:
+                semaphore.release()
+        
+        async def flush(batch: List[DocumentChunk]) -> None:
+            await semaphore.acquire()
+            # Surface a failed write before producing more, and drop finished tasks
+            for task in [task for task in tasks if task.done()]:
+                tasks.remove(task)
+                task.result()
+            tasks.append(asyncio.create_task(write(batch)))
+        
+        count = 0
+        batch: List[DocumentChunk] = []
+        try:
+            async for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    await flush(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+                count += len(batch)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return count
+    
+    async def _embed_missing(self, chunks: List[DocumentChunk]) -> None:
+        """Fill in missing chunk embeddings with batched provider calls."""
+        pending = [chunk for chunk in chunks if chunk.embedding is None]
+        batch_size = settings.embedding_batch_size
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            embeddings = await get_embedding_provider().generate_embeddings([chunk.content for chunk in batch])
+            for chunk, embedding in zip(batch, embeddings):
+                chunk.embedding = embedding
+    
+    async def _skip_unchanged(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Drop chunks already stored with identical content and metadata, so re-ingesting
+        an unchanged record costs neither an embedding nor a write."""
+        if not settings.skip_unchanged_chunks or not chunks:
+            return chunks
+        try:
+            unchanged = await get_document_index().unchanged_chunks(chunks)
+        except Exception as e:
+            logger.warning(f"Failed to check for unchanged chunks: {e}")
+            return chunks
+        
+        if unchanged:
+            logger.info(f"Skipping {len(unchanged)} unchanged chunks")
+            chunks = [chunk for chunk in chunks if chunk.chunk_id not in unchanged]
+        return chunks
+    
+    async def _index_documents(self, chunks: List[DocumentChunk]) -> None:
+        """Record upserted chunks' documents in the side index and retire stale chat answers."""
+        try:
+            await get_document_index().add_chunks(chunks)
+        except Exception as e:
+            logger.warning(f"Failed to update document index: {e}")
+        await get_response_cache().invalidate()
+    
+    async def _unindex_document(self, doc_id: str) -> None:
+        """Remove a deleted document from the side index and retire stale chat answers."""
+        try:
+            await get_document_index().remove(doc_id)
+        except Exception as e:
+            logger.warning(f"Failed to update document index: {e}")
+        await get_response_cache().invalidate()
 
 
 class PineconeStore(VectorStore):
@@ -79,10 +202,12 @@ class PineconeStore(VectorStore):
             
             if self.index_name not in existing_indexes:
                 # Create index
+                provider = get_embedding_provider()
                 pinecone.create_index(
                     name=self.index_name,
-                    dimension=embedding_provider.get_dimension(),
-                    metric="cosine"
+                    dimension=provider.get_dimension(),
+                    # Normalized embeddings make dot product equal to cosine similarity
+                    metric="dotproduct" if provider.normalized else "cosine"
                 )
                 logger.info(f"Created Pinecone index: {self.index_name}")
             
@@ -96,13 +221,13 @@ class PineconeStore(VectorStore):
     async def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
         """Upsert chunks to Pinecone."""
         try:
-            vectors = []
+            chunks = await self._skip_unchanged(chunks)
+            if not chunks:
+                return
+            await self._embed_missing(chunks)
             
+            vectors = []
             for chunk in chunks:
-                # Generate embedding if not present
-                if not chunk.embedding:
-                    chunk.embedding = await embedding_provider.generate_single_embedding(chunk.content)
-                
                 # Prepare metadata
                 metadata = {
                     "doc_id": chunk.doc_id,
@@ -118,24 +243,32 @@ class PineconeStore(VectorStore):
                     metadata["product_version"] = chunk.metadata.product_version
                 
                 if chunk.metadata.tags:
-                    metadata["tags"] = ",".join(chunk.metadata.tags)
+                    metadata["tags"] = list(chunk.metadata.tags)
                 
                 # Add custom metadata
                 metadata.update(chunk.metadata.metadata)
                 
                 vectors.append({
                     "id": chunk.chunk_id,
-                    "values": chunk.embedding,
+                    "values": chunk.embedding.tolist(),
                     "metadata": metadata
                 })
             
-            # Upsert in batches
+            # Upsert in batches, several at a time; the client is blocking so each runs on a thread
             batch_size = 100
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                self.index.upsert(vectors=batch)
+            semaphore = asyncio.Semaphore(_PINECONE_UPSERT_CONCURRENCY)
+            
+            async def upsert_batch(batch: List[Dict[str, Any]]) -> None:
+                async with semaphore:
+                    await asyncio.to_thread(self.index.upsert, vectors=batch)
+            
+            await asyncio.gather(*(
+                upsert_batch(vectors[i:i + batch_size])
+                for i in range(0, len(vectors), batch_size)
+            ))
             
             logger.info(f"Upserted {len(chunks)} chunks to Pinecone")
+            await self._index_documents(chunks)
             
         except Exception as e:
             logger.error(f"Error upserting to Pinecone: {e}")
@@ -150,7 +283,7 @@ class PineconeStore(VectorStore):
         """Search Pinecone for similar chunks."""
         try:
             # Generate query embedding
-            query_embedding = await embedding_provider.generate_single_embedding(query)
+            query_embedding = await get_query_embedding(query)
             
             # Prepare filters
             pinecone_filter = {}
@@ -159,10 +292,14 @@ class PineconeStore(VectorStore):
                     pinecone_filter["product_version"] = {"$eq": filters["product_version"]}
                 if "source_type" in filters:
                     pinecone_filter["source_type"] = {"$eq": filters["source_type"]}
+                if filters.get("tags"):
+                    pinecone_filter["tags"] = {"$in": list(filters["tags"])}
+                if filters.get("document_ids"):
+                    pinecone_filter["doc_id"] = {"$in": list(filters["document_ids"])}
             
             # Search
             results = self.index.query(
-                vector=query_embedding,
+                vector=query_embedding.tolist(),
                 top_k=limit,
                 include_metadata=True,
                 filter=pinecone_filter if pinecone_filter else None
@@ -173,28 +310,23 @@ class PineconeStore(VectorStore):
             for match in results.matches:
                 metadata = match.metadata
                 
-                # Reconstruct DocumentChunk
-                from ..models import DocumentMetadata, DocumentSource
-                from datetime import datetime
-                
-                doc_metadata = DocumentMetadata(
+                # Stored payloads were validated on the way in, so skip re-validation
+                doc_metadata = DocumentMetadata.model_construct(
                     doc_id=metadata["doc_id"],
                     title=metadata["title"],
-                    source_type=DocumentSource(metadata["source_type"]),
+                    source_type=_source_type(metadata["source_type"]),
                     product_version=metadata.get("product_version"),
                     created_at=datetime.fromisoformat(metadata["created_at"]),
-                    tags=metadata.get("tags", "").split(",") if metadata.get("tags") else [],
-                    metadata={k: v for k, v in metadata.items() 
-                             if k not in ["doc_id", "content", "title", "source_type", 
-                                        "chunk_index", "created_at", "product_version", "tags"]}
+                    tags=_stored_tags(metadata.get("tags")),
+                    metadata={k: metadata[k] for k in metadata.keys() - _RESERVED_METADATA_KEYS}
                 )
                 
-                chunk = DocumentChunk(
+                chunk = DocumentChunk.model_construct(
                     chunk_id=match.id,
                     doc_id=metadata["doc_id"],
                     content=metadata["content"],
                     metadata=doc_metadata,
-                    chunk_index=metadata["chunk_index"]
+                    chunk_index=int(metadata["chunk_index"])  # Pinecone returns numbers as floats
                 )
                 
                 chunks_with_scores.append((chunk, match.score))
@@ -208,19 +340,10 @@ class PineconeStore(VectorStore):
     async def delete_by_doc_id(self, doc_id: str) -> None:
         """Delete chunks by document ID."""
         try:
-            # Query to get all chunk IDs for the document
-            results = self.index.query(
-                vector=[0] * embedding_provider.get_dimension(),  # Dummy vector
-                top_k=10000,  # Large number to get all chunks
-                include_metadata=True,
-                filter={"doc_id": {"$eq": doc_id}}
-            )
-            
-            # Delete chunks
-            chunk_ids = [match.id for match in results.matches]
-            if chunk_ids:
-                self.index.delete(ids=chunk_ids)
-                logger.info(f"Deleted {len(chunk_ids)} chunks for doc_id: {doc_id}")
+            # Delete by metadata filter in one call instead of enumerating chunk IDs first
+            await asyncio.to_thread(self.index.delete, filter={"doc_id": {"$eq": doc_id}})
+            logger.info(f"Deleted chunks for doc_id: {doc_id}")
+            await self._unindex_document(doc_id)
             
         except Exception as e:
             logger.error(f"Error deleting from Pinecone: {e}")
@@ -238,8 +361,8 @@ class PineconeStore(VectorStore):
     async def get_all_documents(self) -> List[Dict[str, Any]]:
         """Get all documents in the knowledge base."""
         try:
-            # This is a simple implementation - could be optimized
-            return []  # Pinecone doesn't easily support document listing
+            # Pinecone can't aggregate by metadata, so documents are listed from the side index
+            return await get_document_index().list_documents()
         except Exception as e:
             logger.error(f"Error getting documents from Pinecone: {e}")
             raise
@@ -266,21 +389,47 @@ class WeaviateStore(VectorStore):
             )
         else:
             self.client = weaviate.Client(url=settings.weaviate_url)
+        
+        # Flush upserts in parallel background batches, sized dynamically from observed latency
+        self.client.batch.configure(
+            batch_size=100,
+            dynamic=True,
+            num_workers=4,
+            connection_error_retries=3
+        )
         self.class_name = "DocumentChunk"
+        self.distance = "cosine"
+        self.pq_enabled = False
+        # Approximate object count, kept locally so Weaviate is only asked for the real
+        # count once PQ could plausibly be enabled
+        self._approx_count = 0
     
     async def initialize(self) -> None:
         """Initialize Weaviate schema."""
         try:
             # Check if class exists
             schema = self.client.schema.get()
-            class_exists = any(cls["class"] == self.class_name for cls in schema.get("classes", []))
+            existing_class = next(
+                (cls for cls in schema.get("classes", []) if cls["class"] == self.class_name),
+                None
+            )
             
-            if not class_exists:
+            if existing_class:
+                # Keep scoring consistent with whatever metric the class was created with
+                index_config = existing_class.get("vectorIndexConfig", {})
+                self.distance = index_config.get("distance", "cosine")
+                self.pq_enabled = index_config.get("pq", {}).get("enabled", False)
+                if settings.weaviate_pq_enabled and not self.pq_enabled:
+                    self._approx_count = await asyncio.to_thread(self._object_count)
+            else:
+                self.distance = "dot" if get_embedding_provider().normalized else "cosine"
+                
                 # Create class schema
                 class_schema = {
                     "class": self.class_name,
                     "description": "Document chunks for AI support chatbot",
                     "vectorizer": "none",  # We provide our own vectors
+                    "vectorIndexConfig": {"distance": self.distance},
                     "properties": [
                         {"name": "doc_id", "dataType": ["string"]},
                         {"name": "content", "dataType": ["text"]},
@@ -306,12 +455,15 @@ class WeaviateStore(VectorStore):
     async def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
         """Upsert chunks to Weaviate."""
         try:
+            chunks = await self._skip_unchanged(chunks)
+            if not chunks:
+                return
+            
+            # Embed before opening the batch so no awaits happen while it holds buffered objects
+            await self._embed_missing(chunks)
+            
             with self.client.batch as batch:
                 for chunk in chunks:
-                    # Generate embedding if not present
-                    if not chunk.embedding:
-                        chunk.embedding = await embedding_provider.generate_single_embedding(chunk.content)
-                    
                     # Prepare data object
                     data_object = {
                         "doc_id": chunk.doc_id,
@@ -322,22 +474,56 @@ class WeaviateStore(VectorStore):
                         "product_version": chunk.metadata.product_version,
                         "created_at": chunk.metadata.created_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
                         "tags": chunk.metadata.tags,
-                        "metadata": json.dumps(chunk.metadata.metadata) if chunk.metadata.metadata else "{}",
+                        "metadata": orjson.dumps(chunk.metadata.metadata, option=orjson.OPT_NON_STR_KEYS).decode() if chunk.metadata.metadata else "{}",
                     }
                     
                     batch.add_data_object(
                         data_object=data_object,
                         class_name=self.class_name,
-                        uuid=chunk.chunk_id,
+                        # Weaviate object IDs must be UUIDs; derive a stable one from the chunk ID
+                        uuid=generate_uuid5(chunk.chunk_id),
                         vector=chunk.embedding
                     )
             
             logger.info(f"Upserted {len(chunks)} chunks to Weaviate")
+            await self._index_documents(chunks)
+            
+            if settings.weaviate_pq_enabled and not self.pq_enabled:
+                self._approx_count += len(chunks)
+                if self._approx_count >= settings.weaviate_pq_threshold:
+                    await asyncio.to_thread(self._maybe_enable_pq)
             
         except Exception as e:
             logger.error(f"Error upserting to Weaviate: {e}")
             raise
     
+    def _object_count(self) -> int:
+        """Count the stored objects (blocking)."""
+        result = self.client.query.aggregate(self.class_name).with_meta_count().do()
+        return result["data"]["Aggregate"][self.class_name][0]["meta"]["count"]
+    
+    def _maybe_enable_pq(self) -> None:
+        """Turn on product quantization once enough vectors exist to train the codebook (blocking)."""
+        count = self._object_count()
+        if count < settings.weaviate_pq_threshold:
+            # Re-upserted chunks inflated the estimate; resync it with the real count
+            self._approx_count = count
+            return
+        
+        # Segments must divide the vector dimension; 0 lets Weaviate pick
+        dimension = get_embedding_provider().get_dimension()
+        segments = settings.weaviate_pq_segments
+        if segments and dimension % segments:
+            segments = 0
+        
+        self.client.schema.update_config(self.class_name, {
+            "vectorIndexConfig": {
+                "pq": {"enabled": True, "segments": segments, "centroids": 256}
+            }
+        })
+        self.pq_enabled = True
+        logger.info(f"Enabled PQ compression for {self.class_name} at {count} objects")
+    
     async def search(
         self, 
         query: str, 
@@ -347,7 +533,7 @@ class WeaviateStore(VectorStore):
         """Search Weaviate for similar chunks."""
         try:
             # Generate query embedding
-            query_embedding = await embedding_provider.generate_single_embedding(query)
+            query_embedding = await get_query_embedding(query)
             
             # Build query
             query_builder = (
@@ -358,7 +544,7 @@ class WeaviateStore(VectorStore):
                 ])
                 .with_near_vector({"vector": query_embedding})
                 .with_limit(limit)
-                .with_additional(["distance", "id"])
+                .with_additional(["distance"])
             )
             
             # Add filters
@@ -380,17 +566,12 @@ class WeaviateStore(VectorStore):
                     })
                 
                 if "document_ids" in filters and filters["document_ids"]:
-                    doc_filter = {
-                        "operator": "Or",
-                        "operands": [
-                            {
-                                "path": ["doc_id"],
-                                "operator": "Equal", 
-                                "valueString": doc_id
-                            } for doc_id in filters["document_ids"]
-                        ]
-                    }
-                    where_filter["operands"].append(doc_filter)
+                    # One ContainsAny clause instead of an Or chain of per-document Equals
+                    where_filter["operands"].append({
+                        "path": ["doc_id"],
+                        "operator": "ContainsAny",
+                        "valueStringArray": list(filters["document_ids"])
+                    })
                 
                 if where_filter["operands"]:
                     query_builder = query_builder.with_where(where_filter)
@@ -401,22 +582,21 @@ class WeaviateStore(VectorStore):
             # Convert results to DocumentChunk objects
             chunks_with_scores = []
             for item in results["data"]["Get"][self.class_name]:
-                from ..models import DocumentMetadata, DocumentSource
-                from datetime import datetime
-                import json
-                
-                doc_metadata = DocumentMetadata(
+                # Stored payloads were validated on the way in, so skip re-validation
+                doc_metadata = DocumentMetadata.model_construct(
                     doc_id=item["doc_id"],
                     title=item["title"],
-                    source_type=DocumentSource(item["source_type"]),
+                    source_type=_source_type(item["source_type"]),
                     product_version=item.get("product_version"),
                     created_at=datetime.fromisoformat(item["created_at"]),
                     tags=item.get("tags", []),
-                    metadata=json.loads(item.get("metadata", "{}")) if isinstance(item.get("metadata"), str) else item.get("metadata", {})
+                    metadata=orjson.loads(item.get("metadata", "{}")) if isinstance(item.get("metadata"), str) else item.get("metadata", {})
                 )
                 
-                chunk = DocumentChunk(
-                    chunk_id=item["_additional"]["id"],
+                chunk = DocumentChunk.model_construct(
+                    # Objects are keyed by a UUID derived from the chunk ID; rebuild the
+                    # original ID so results match Pinecone's and the document index's
+                    chunk_id=f"{item['doc_id']}_{item['chunk_index']}",
                     doc_id=item["doc_id"],
                     content=item["content"],
                     metadata=doc_metadata,
@@ -424,7 +604,7 @@ class WeaviateStore(VectorStore):
                 )
                 
                 # Convert distance to similarity score (lower distance = higher similarity)
-                similarity = 1 - item["_additional"]["distance"]
+                similarity = self._to_similarity(item["_additional"]["distance"])
                 chunks_with_scores.append((chunk, similarity))
             
             return chunks_with_scores
@@ -433,6 +613,13 @@ class WeaviateStore(VectorStore):
             logger.error(f"Error searching Weaviate: {e}")
             raise
     
+    def _to_similarity(self, distance: float) -> float:
+        """Convert a Weaviate distance into a similarity score."""
+        if self.distance == "dot":
+            # Weaviate reports the negative dot product as the distance
+            return -distance
+        return 1 - distance
+    
     async def delete_by_doc_id(self, doc_id: str) -> None:
         """Delete chunks by document ID."""
         try:
@@ -448,6 +635,7 @@ class WeaviateStore(VectorStore):
             )
             
             logger.info(f"Deleted chunks for doc_id: {doc_id}")
+            await self._unindex_document(doc_id)
             
         except Exception as e:
             logger.error(f"Error deleting from Weaviate: {e}")
@@ -465,7 +653,11 @@ class WeaviateStore(VectorStore):
     async def get_all_documents(self) -> List[Dict[str, Any]]:
         """Get all documents in the knowledge base."""
         try:
-            # Group chunks by document
+            document_index = get_document_index()
+            if document_index.persistent:
+                return await document_index.list_documents()
+            
+            # Without a shared index, group chunks by document
             result = self.client.query.get(
                 self.class_name,
                 ["title", "doc_id", "source_type", "created_at", "product_version"]
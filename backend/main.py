@@ -1,24 +1,35 @@
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
+import asyncio
+import hashlib
 import uuid
 import logging
 import os
-import json
-import tempfile
+import time
+import orjson
 import aiofiles
+import ijson
+import numpy as np
 from datetime import datetime
 
 from app.config import settings
 from app.models import (
     ChatRequest, ChatResponse, FeedbackRequest, 
     IngestRequest, IngestResponse, HealthResponse,
-    Source, DocumentSource, ErrorResponse
+    Source, DocumentSource, DocumentChunk, DocumentMetadata, ErrorResponse
 )
-from app.services.llm import llm_provider
+from app.services.batcher import get_search_coalescer
+from app.services.cache import get_response_cache
+from app.services.document_index import get_document_index
+from app.services.embeddings import get_query_embedding
+from app.services.http_client import close_http_client
+from app.services.llm import LLMProvider, get_llm_provider
+from app.services.storage import get_conversation_store, get_feedback_store
+from app.services.tasks import get_task_store
 from app.services.vector_store import get_vector_store
 from app.services.ingestion import ingestion_service
-from app.services.embeddings import embedding_provider
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
@@ -28,7 +39,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="AI Support Chatbot API",
     description="Configurable AI-powered support chatbot with multi-source data ingestion",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -40,9 +52,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for conversations and feedback (use Redis/DB in production)
-conversations: Dict[str, List[Dict[str, Any]]] = {}
-feedback_store: List[Dict[str, Any]] = []
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+_pending_tasks: Set[asyncio.Task] = set()
+
+
+def _now_ms() -> int:
+    """Current time as epoch milliseconds, the compact form stored in conversation history."""
+    return time.time_ns() // 1_000_000
 
 
 @app.on_event("startup")
@@ -51,13 +67,13 @@ async def startup_event():
     try:
         logger.info("Initializing AI Support Chatbot API...")
         
-        # Initialize vector store
-        vector_store = get_vector_store()
-        await vector_store.initialize()
+        # Initialize vector store and check LLM provider health concurrently
+        _, llm_healthy = await asyncio.gather(
+            get_vector_store().initialize(),
+            get_llm_provider().health_check()
+        )
         logger.info(f"Vector store initialized: {settings.vector_db}")
         
-        # Check LLM provider health
-        llm_healthy = await llm_provider.health_check()
         if not llm_healthy:
             logger.warning(f"LLM provider {settings.llm_provider} health check failed")
         
@@ -68,16 +84,21 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled connections on shutdown."""
+    await close_http_client()
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
     try:
-        # Check vector store health
-        vector_store = get_vector_store()
-        vector_healthy = await vector_store.health_check()
-        
-        # Check LLM provider health
-        llm_healthy = await llm_provider.health_check()
+        # Check vector store and LLM provider health concurrently
+        vector_healthy, llm_healthy = await asyncio.gather(
+            get_vector_store().health_check(),
+            get_llm_provider().health_check()
+        )
         
         status = "healthy" if vector_healthy and llm_healthy else "degraded"
         
@@ -94,65 +115,181 @@ async def health_check():
         raise HTTPException(status_code=500, detail="Health check failed")
 
 
+async def _start_chat(request: ChatRequest) -> Tuple[str, str, Optional[np.ndarray]]:
+    """Record the user's message; returns the conversation ID, response cache scope and query embedding."""
+    # Debug: Log the exact request details
+    logger.info(f"FRONTEND REQUEST - user_id: {request.user_id}, query: '{request.query}', product_version: {request.product_version}")
+    
+    # Generate conversation ID if not provided
+    conversation_id = request.conversation_id or str(uuid.uuid4())
+    
+    # Store conversation message
+    await get_conversation_store().append(conversation_id, {
+        "role": "user",
+        "content": request.query,
+        "timestamp": _now_ms()
+    })
+    
+    cache_scope = f"{request.product_version or ''}:{','.join(sorted(request.document_ids or []))}"
+    query_embedding = await get_query_embedding(request.query) if settings.chat_cache_enabled else None
+    return conversation_id, cache_scope, query_embedding
+
+
+async def _cached_answer(
+    request: ChatRequest,
+    conversation_id: str,
+    cache_scope: str,
+    query_embedding: Optional[np.ndarray]
+) -> Optional[ChatResponse]:
+    """Answer a repeated question from the response cache, skipping retrieval and generation."""
+    if query_embedding is None:
+        return None
+    
+    cached = await get_response_cache().get(cache_scope, request.query, query_embedding)
+    if cached is None:
+        return None
+    
+    response = ChatResponse.model_validate_json(cached).model_copy(
+        update={"conversation_id": conversation_id}
+    )
+    await get_conversation_store().append(conversation_id, {
+        "role": "assistant",
+        "content": response.answer,
+        "timestamp": _now_ms(),
+        "sources": [source.model_dump() for source in response.sources],
+        "confidence": response.confidence
+    })
+    return response
+
+
+async def _retrieve(request: ChatRequest, llm_provider: LLMProvider) -> List[Tuple[DocumentChunk, float]]:
+    """Search for the chunks to answer from, warming up the LLM meanwhile."""
+    # Load the LLM while the vector search runs, so generation doesn't wait for it afterwards
+    warmup_task = asyncio.create_task(llm_provider.warmup())
+    _pending_tasks.add(warmup_task)
+    warmup_task.add_done_callback(_pending_tasks.discard)
+    
+    # Search for relevant chunks
+    filters = {}
+    if request.product_version:
+        filters["product_version"] = request.product_version
+    if request.document_ids:
+        filters["document_ids"] = request.document_ids
+    
+    # Concurrent identical questions share one vector search
+    search_results = await get_search_coalescer().search(
+        query=request.query,
+        limit=settings.max_retrieved_chunks,
+        filters=filters
+    )
+    
+    # Debug logging
+    logger.info(f"Search query: {request.query}")
+    logger.info(f"Search results count: {len(search_results)}")
+    if search_results:
+        logger.info(f"Top result similarity: {search_results[0][1]}")
+        logger.info(f"Similarity threshold: {settings.similarity_threshold}")
+    
+    return search_results
+
+
+async def _fallback_answer(conversation_id: str) -> ChatResponse:
+    """Answer when retrieval found nothing relevant enough."""
+    fallback_answer = "I don't have enough information to answer that question. Please contact our support team for assistance."
+    
+    await get_conversation_store().append(conversation_id, {
+        "role": "assistant",
+        "content": fallback_answer,
+        "timestamp": _now_ms(),
+        "fallback": True
+    })
+    
+    return ChatResponse(
+        answer=fallback_answer,
+        sources=[],
+        conversation_id=conversation_id,
+        confidence=0.0,
+        fallback_triggered=True
+    )
+
+
+async def _finish_chat(
+    request: ChatRequest,
+    conversation_id: str,
+    cache_scope: str,
+    query_embedding: Optional[np.ndarray],
+    search_results: List[Tuple[DocumentChunk, float]],
+    response_text: str
+) -> ChatResponse:
+    """Attach sources to a generated answer, record it and cache it."""
+    # Create source information grouped by document in one pass, keeping the
+    # highest score per document and the first chunk's ticket and chunk IDs
+    groups = {}
+    for chunk, score in search_results:
+        doc_key = (chunk.metadata.title, chunk.metadata.source_type)
+        group = groups.get(doc_key)
+        if group is None:
+            groups[doc_key] = (score, chunk.metadata.metadata.get("ticket_id"), chunk.chunk_id)
+        elif score > group[0]:
+            groups[doc_key] = (score,) + group[1:]
+    
+    sources = [
+        Source(
+            doc_title=doc_title,
+            section=None,  # Could be enhanced to include section info
+            source_type=source_type,
+            ticket_id=ticket_id,
+            confidence=confidence,
+            chunk_id=chunk_id
+        )
+        for (doc_title, source_type), (confidence, ticket_id, chunk_id) in groups.items()
+    ]
+    
+    # Calculate overall confidence (average of top results)
+    overall_confidence = sum(score for _, score in search_results[:3]) / min(3, len(search_results))
+    
+    # Store assistant response
+    await get_conversation_store().append(conversation_id, {
+        "role": "assistant",
+        "content": response_text,
+        "timestamp": _now_ms(),
+        "sources": [source.model_dump() for source in sources],
+        "confidence": overall_confidence
+    })
+    
+    response = ChatResponse(
+        answer=response_text,
+        sources=sources,
+        conversation_id=conversation_id,
+        confidence=overall_confidence,
+        fallback_triggered=False
+    )
+    if query_embedding is not None:
+        await get_response_cache().set(cache_scope, request.query, query_embedding, response.model_dump_json().encode())
+    return response
+
+
+def _sse(data: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event."""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """Main chat endpoint."""
     try:
-        # Debug: Log the exact request details
-        logger.info(f"FRONTEND REQUEST - user_id: {request.user_id}, query: '{request.query}', product_version: {request.product_version}")
+        conversation_id, cache_scope, query_embedding = await _start_chat(request)
         
-        # Generate conversation ID if not provided
-        conversation_id = request.conversation_id or str(uuid.uuid4())
-        
-        # Store conversation message
-        if conversation_id not in conversations:
-            conversations[conversation_id] = []
-        
-        conversations[conversation_id].append({
-            "role": "user",
-            "content": request.query,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-        # Search for relevant chunks
-        filters = {}
-        if request.product_version:
-            filters["product_version"] = request.product_version
-        if request.document_ids:
-            filters["document_ids"] = request.document_ids
-        
-        search_results = await get_vector_store().search(
-            query=request.query,
-            limit=settings.max_retrieved_chunks,
-            filters=filters
-        )
+        response = await _cached_answer(request, conversation_id, cache_scope, query_embedding)
+        if response is not None:
+            return response
         
-        # Debug logging
-        logger.info(f"Search query: {request.query}")
-        logger.info(f"Search results count: {len(search_results)}")
-        if search_results:
-            logger.info(f"Top result similarity: {search_results[0][1]}")
-            logger.info(f"Similarity threshold: {settings.similarity_threshold}")
+        llm_provider = get_llm_provider()
+        search_results = await _retrieve(request, llm_provider)
         
         # Check if we have good enough results
         if not search_results or search_results[0][1] < settings.similarity_threshold:
-            # Fallback response
-            fallback_answer = "I don't have enough information to answer that question. Please contact our support team for assistance."
-            
-            conversations[conversation_id].append({
-                "role": "assistant",
-                "content": fallback_answer,
-                "timestamp": datetime.utcnow().isoformat(),
-                "fallback": True
-            })
-            
-            return ChatResponse(
-                answer=fallback_answer,
-                sources=[],
-                conversation_id=conversation_id,
-                confidence=0.0,
-                fallback_triggered=True
-            )
+            return await _fallback_answer(conversation_id)
         
         # Extract chunks and generate response
         chunks = [result[0] for result in search_results]
@@ -161,58 +298,8 @@ async def chat(request: ChatRequest):
             context_chunks=chunks
         )
         
-        # Create source information grouped by document
-        source_groups = {}
-        for chunk, score in search_results:
-            doc_key = f"{chunk.metadata.title}_{chunk.metadata.source_type}"
-            
-            if doc_key not in source_groups:
-                source_groups[doc_key] = {
-                    'doc_title': chunk.metadata.title,
-                    'source_type': chunk.metadata.source_type,
-                    'ticket_id': chunk.metadata.metadata.get("ticket_id"),
-                    'scores': [],
-                    'chunk_ids': []
-                }
-            
-            source_groups[doc_key]['scores'].append(score)
-            source_groups[doc_key]['chunk_ids'].append(chunk.chunk_id)
-        
-        # Create aggregated sources
-        sources = []
-        for group_data in source_groups.values():
-            # Use the highest confidence score for the document
-            max_confidence = max(group_data['scores'])
-            # Or use average: avg_confidence = sum(group_data['scores']) / len(group_data['scores'])
-            
-            source = Source(
-                doc_title=group_data['doc_title'],
-                section=None,  # Could be enhanced to include section info
-                source_type=group_data['source_type'],
-                ticket_id=group_data['ticket_id'],
-                confidence=max_confidence,
-                chunk_id=group_data['chunk_ids'][0]  # Use first chunk ID as representative
-            )
-            sources.append(source)
-        
-        # Calculate overall confidence (average of top results)
-        overall_confidence = sum(score for _, score in search_results[:3]) / min(3, len(search_results))
-        
-        # Store assistant response
-        conversations[conversation_id].append({
-            "role": "assistant",
-            "content": response_text,
-            "timestamp": datetime.utcnow().isoformat(),
-            "sources": [source.dict() for source in sources],
-            "confidence": overall_confidence
-        })
-        
-        return ChatResponse(
-            answer=response_text,
-            sources=sources,
-            conversation_id=conversation_id,
-            confidence=overall_confidence,
-            fallback_triggered=False
+        return await _finish_chat(
+            request, conversation_id, cache_scope, query_embedding, search_results, response_text
         )
         
     except Exception as e:
@@ -223,6 +310,59 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Chat endpoint that streams the answer as server-sent events.
+    
+    Sends `{"t": text}` events as the answer is generated, then a final `{"done": true, ...}`
+    event carrying the rest of the ChatResponse (conversation ID, sources, confidence).
+    """
+    try:
+        conversation_id, cache_scope, query_embedding = await _start_chat(request)
+        
+        response = await _cached_answer(request, conversation_id, cache_scope, query_embedding)
+        if response is None:
+            llm_provider = get_llm_provider()
+            search_results = await _retrieve(request, llm_provider)
+            if not search_results or search_results[0][1] < settings.similarity_threshold:
+                response = await _fallback_answer(conversation_id)
+    except Exception as e:
+        logger.error(f"Error in chat stream endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+    
+    async def events() -> AsyncIterator[bytes]:
+        final = response
+        if final is None:
+            try:
+                parts = []
+                async for part in llm_provider.stream_response(
+                    prompt=request.query,
+                    context_chunks=[result[0] for result in search_results]
+                ):
+                    parts.append(part)
+                    yield _sse({"t": part})
+                
+                # The answer is recorded and cached only once the stream has drained
+                final = await _finish_chat(
+                    request, conversation_id, cache_scope, query_embedding, search_results, "".join(parts).strip()
+                )
+            except Exception as e:
+                logger.error(f"Error streaming chat response: {e}")
+                yield _sse({"error": "Chat processing failed"})
+                return
+        else:
+            yield _sse({"t": final.answer})
+        
+        yield _sse({"done": True, **final.model_dump(mode="json", exclude={"answer"})})
+    
+    # X-Accel-Buffering stops nginx from holding events back until the response ends
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/feedback")
 async def submit_feedback(request: FeedbackRequest):
     """Submit feedback for a conversation."""
@@ -236,7 +376,7 @@ async def submit_feedback(request: FeedbackRequest):
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        feedback_store.append(feedback_entry)
+        await get_feedback_store().add(feedback_entry)
         
         logger.info(f"Feedback received for conversation {request.conversation_id}: {request.rating}/5")
         
@@ -254,6 +394,7 @@ async def ingest_documents(request: IngestRequest, background_tasks: BackgroundT
         # For long-running ingestion, we might want to use background tasks
         if request.source_type in [DocumentSource.ZENDESK, DocumentSource.JIRA]:
             task_id = str(uuid.uuid4())
+            await get_task_store().update(task_id, "pending")
             background_tasks.add_task(
                 _background_ingestion,
                 task_id,
@@ -300,38 +441,44 @@ async def _background_ingestion(task_id: str, source_type: DocumentSource, filte
     """Background task for long-running ingestion."""
     try:
         logger.info(f"Starting background ingestion task {task_id} for {source_type}")
+        await get_task_store().update(task_id, "running")
         
-        chunks = await ingestion_service.ingest_documents(
-            source_type=source_type,
-            filters=filters
+        # Upsert as pages arrive so only a few batches of chunks are held in memory
+        chunk_count = await get_vector_store().upsert_stream(
+            ingestion_service.iter_documents(source_type, filters),
+            on_progress=lambda count: get_task_store().advance(task_id, count)
         )
         
-        if chunks:
-            await get_vector_store().upsert_chunks(chunks)
-        
-        logger.info(f"Completed background ingestion task {task_id}: {len(chunks)} chunks created")
+        logger.info(f"Completed background ingestion task {task_id}: {chunk_count} chunks created")
+        await get_task_store().update(task_id, "completed")
         
     except Exception as e:
         logger.error(f"Error in background ingestion task {task_id}: {e}")
+        await get_task_store().update(task_id, "failed", error=str(e))
 
 
 @app.get("/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Get conversation history."""
-    if conversation_id not in conversations:
+    messages = await get_conversation_store().get(conversation_id)
+    if messages is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
+    # Timestamps are stored as epoch milliseconds and returned as ISO strings
     return {
         "conversation_id": conversation_id,
-        "messages": conversations[conversation_id]
+        "messages": [
+            {**message, "timestamp": datetime.utcfromtimestamp(message["timestamp"] / 1000).isoformat()}
+            if isinstance(message.get("timestamp"), int) else message
+            for message in messages
+        ]
     }
 
 
 @app.delete("/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str):
     """Delete a conversation."""
-    if conversation_id in conversations:
-        del conversations[conversation_id]
+    if await get_conversation_store().delete(conversation_id):
         return {"success": True}
     
     raise HTTPException(status_code=404, detail="Conversation not found")
@@ -340,16 +487,12 @@ async def delete_conversation(conversation_id: str):
 @app.get("/analytics/feedback")
 async def get_feedback_analytics():
     """Get feedback analytics."""
-    if not feedback_store:
+    total_feedback, rating_sum, histogram = await get_feedback_store().stats()
+    if not total_feedback:
         return {"total_feedback": 0, "average_rating": 0, "rating_distribution": {}}
     
-    total_feedback = len(feedback_store)
-    average_rating = sum(f["rating"] for f in feedback_store) / total_feedback
-    
-    rating_distribution = {}
-    for rating in range(1, 6):
-        count = sum(1 for f in feedback_store if f["rating"] == rating)
-        rating_distribution[str(rating)] = count
+    average_rating = rating_sum / total_feedback
+    rating_distribution = {str(rating): histogram.get(rating, 0) for rating in range(1, 6)}
     
     return {
         "total_feedback": total_feedback,
@@ -358,75 +501,162 @@ async def get_feedback_analytics():
     }
 
 
+class _JsonArrayValidator:
+    """Incrementally checks that staged bytes form a JSON array, counting its records."""
+    
+    # Events that open a top-level array element
+    _ITEM_EVENTS = {"start_map", "start_array", "string", "number", "boolean", "null"}
+    
+    def __init__(self):
+        self.records_count = 0
+        self._events = ijson.sendable_list()
+        self._parser = ijson.parse_coro(self._events)
+        self._started = False
+    
+    def _consume(self) -> None:
+        for prefix, event, _ in self._events:
+            if not self._started:
+                if prefix != "" or event != "start_array":
+                    raise HTTPException(status_code=400, detail="JSON must be an array of objects")
+                self._started = True
+            elif prefix == "item" and event in self._ITEM_EVENTS:
+                self.records_count += 1
+        del self._events[:]
+    
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the upload."""
+        try:
+            self._parser.send(chunk)
+        except ijson.JSONError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        self._consume()
+    
+    def close(self) -> None:
+        """Check that the upload ended with a complete JSON document."""
+        try:
+            self._parser.close()
+        except ijson.JSONError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        self._consume()
+
+
+async def _stage_upload(
+    file: UploadFile,
+    suffix: str,
+    validator: Optional[_JsonArrayValidator] = None
+) -> Tuple[str, int]:
+    """Stream an upload to a temporary file, enforcing MAX_UPLOAD_BYTES while it is read.
+    
+    The file goes on tmpfs if UPLOAD_TMP_DIR points there, and writes don't block the
+    event loop. A validator, if given, sees every chunk as it is written, and the staged
+    file is removed if it rejects the upload. Returns the file's path and size.
+    """
+    if file.size is not None and file.size > settings.max_upload_bytes:
+        raise HTTPException(status_code=413, detail="File too large")
+    
+    file_size = 0
+    async with aiofiles.tempfile.NamedTemporaryFile(
+        "wb", delete=False, suffix=suffix, dir=settings.upload_tmp_dir or None
+    ) as temp_file:
+        temp_file_path = temp_file.name
+        try:
+            while chunk := await file.read(1024 * 1024):
+                file_size += len(chunk)
+                if file_size > settings.max_upload_bytes:
+                    raise HTTPException(status_code=413, detail="File too large")
+                if validator is not None:
+                    validator.feed(chunk)
+                await temp_file.write(chunk)
+            if validator is not None:
+                validator.close()
+        except BaseException:
+            os.unlink(temp_file_path)
+            raise
+    
+    return temp_file_path, file_size
+
+
+def _discard_staged(temp_file_paths: List[str]) -> None:
+    """Delete staged upload files, logging instead of raising on failure."""
+    for temp_file_path in temp_file_paths:
+        try:
+            os.unlink(temp_file_path)
+        except FileNotFoundError:
+            # File ingesters remove their input once it has been read
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to delete temporary file {temp_file_path}: {e}")
+
+
+# Ingestion source for each supported document file extension
+_FILE_SOURCES = {
+    '.pdf': DocumentSource.PDF,
+    '.docx': DocumentSource.DOCX,
+    '.txt': DocumentSource.TEXT,
+    '.md': DocumentSource.MARKDOWN,
+}
+
+
+def _file_extension(filename: str) -> str:
+    """Get a document's lowercased extension, rejecting unsupported file types."""
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension not in _FILE_SOURCES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(_FILE_SOURCES)}"
+        )
+    return file_extension
+
+
+def _file_filters(
+    temp_file_path: str,
+    filename: str,
+    title: Optional[str],
+    product_version: Optional[str],
+    tags: Optional[str],
+    high_fidelity: bool
+) -> Dict[str, Any]:
+    """Build the ingestion filters for an uploaded document."""
+    return {
+        "file_path": temp_file_path,
+        "title": title or filename,
+        "product_version": product_version,
+        "tags": [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else [],
+        "high_fidelity": high_fidelity,
+        # The staged copy is ours to remove once the ingester has read it
+        "delete_after_ingest": True
+    }
+
+
 @app.post("/upload/file")
 async def upload_file(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
     product_version: Optional[str] = Form(None),
-    tags: Optional[str] = Form(None)
+    tags: Optional[str] = Form(None),
+    high_fidelity: bool = Form(False)
 ):
     """Upload and process a document file (DOCX, PDF, TXT, MD)."""
     try:
         # Validate file type
-        allowed_extensions = {'.pdf', '.docx', '.txt', '.md'}
-        file_extension = os.path.splitext(file.filename)[1].lower()
+        file_extension = _file_extension(file.filename)
         
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
-            )
+        # Stream the upload to a temporary file, rejecting it as soon as it is too large
+        temp_file_path, file_size = await _stage_upload(file, file_extension)
         
-        # Create temporary file and stream upload to disk to avoid loading into memory
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            temp_file_path = temp_file.name
-            # Stream in chunks
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                temp_file.write(chunk)
-
-        # Compute file size from disk for reliability
-        file_size = os.path.getsize(temp_file_path)
-        
-        # Process tags
-        tag_list = []
-        if tags:
-            tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
-        
-        # Prepare filters for ingestion
-        filters = {
-            "file_path": temp_file_path,
-            "title": title or file.filename,
-            "product_version": product_version,
-            "tags": tag_list
-        }
-        
-        # Determine source type based on extension
-        if file_extension == '.pdf':
-            source_type = DocumentSource.PDF
-        elif file_extension == '.docx':
-            source_type = DocumentSource.DOCX
-        elif file_extension == '.txt':
-            source_type = DocumentSource.TEXT
-        elif file_extension == '.md':
-            source_type = DocumentSource.MARKDOWN
-        else:
-            # This shouldn't happen due to validation above, but just in case
-            source_type = DocumentSource.TEXT
+        filters = _file_filters(temp_file_path, file.filename, title, product_version, tags, high_fidelity)
         
         # Create background task ID
         task_id = str(uuid.uuid4())
+        await get_task_store().update(task_id, "pending")
         
         # Schedule background ingestion
         background_tasks.add_task(
             _background_file_ingestion,
             task_id,
-            source_type,
-            filters,
-            temp_file_path
+            [(_FILE_SOURCES[file_extension], filters)],
+            [temp_file_path]
         )
         
         logger.info(f"File upload initiated: {file.filename}, task_id: {task_id}")
@@ -446,6 +676,74 @@ async def upload_file(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/upload/files")
+async def upload_files(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    metadatas: Optional[str] = Form(None)
+):
+    """Upload several document files in one request, ingested together as one task.
+    
+    `metadatas` is an optional JSON array with one object per file (title, product_version,
+    tags, high_fidelity), in the same order as the files.
+    """
+    temp_file_paths = []
+    try:
+        try:
+            metadata_list = orjson.loads(metadatas) if metadatas else [{} for _ in files]
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="metadatas must be a JSON array")
+        if (
+            not isinstance(metadata_list, list)
+            or len(metadata_list) != len(files)
+            or not all(isinstance(metadata, dict) for metadata in metadata_list)
+        ):
+            raise HTTPException(status_code=400, detail="metadatas must have one entry per file")
+        
+        # Validate every file type before staging any of them
+        extensions = [_file_extension(file.filename) for file in files]
+        
+        sources = []
+        uploaded = []
+        for file, file_extension, metadata in zip(files, extensions, metadata_list):
+            temp_file_path, file_size = await _stage_upload(file, file_extension)
+            temp_file_paths.append(temp_file_path)
+            tags = metadata.get("tags")
+            filters = _file_filters(
+                temp_file_path,
+                file.filename,
+                metadata.get("title"),
+                metadata.get("product_version"),
+                ",".join(tags) if isinstance(tags, list) else tags,
+                bool(metadata.get("high_fidelity", False))
+            )
+            sources.append((_FILE_SOURCES[file_extension], filters))
+            uploaded.append({"file_name": file.filename, "file_size": file_size})
+        
+        task_id = str(uuid.uuid4())
+        await get_task_store().update(task_id, "pending")
+        
+        # One task streams every file's chunks into the same upsert batches
+        background_tasks.add_task(_background_file_ingestion, task_id, sources, temp_file_paths)
+        
+        logger.info(f"Batch upload initiated: {len(files)} files, task_id: {task_id}")
+        
+        return {
+            "success": True,
+            "message": f"{len(files)} files uploaded successfully and are being processed",
+            "task_id": task_id,
+            "files": uploaded
+        }
+        
+    except HTTPException:
+        _discard_staged(temp_file_paths)
+        raise
+    except Exception as e:
+        _discard_staged(temp_file_paths)
+        logger.error(f"Error uploading files: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/upload/json")
 async def upload_json_data(
     background_tasks: BackgroundTasks,
@@ -467,25 +765,20 @@ async def upload_json_data(
                 detail=f"Invalid data_type. Must be one of: {', '.join(valid_types)}"
             )
         
-        # Read and parse JSON
-        content = await file.read()
-        try:
-            json_data = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
-        
-        # Validate JSON structure
-        if not isinstance(json_data, list):
-            raise HTTPException(status_code=400, detail="JSON must be an array of objects")
+        # Stage the upload on disk, validating and counting records as it streams through;
+        # the background task parses records incrementally instead of holding them all in memory
+        validator = _JsonArrayValidator()
+        temp_file_path, _ = await _stage_upload(file, ".json", validator)
         
         # Create task ID
         task_id = str(uuid.uuid4())
+        await get_task_store().update(task_id, "pending")
         
         # Schedule background processing
         background_tasks.add_task(
             _background_json_ingestion,
             task_id,
-            json_data,
+            temp_file_path,
             data_type,
             product_version
         )
@@ -497,7 +790,7 @@ async def upload_json_data(
             "message": f"JSON data uploaded successfully and is being processed",
             "task_id": task_id,
             "data_type": data_type,
-            "records_count": len(json_data)
+            "records_count": validator.records_count
         }
         
     except HTTPException:
@@ -509,146 +802,198 @@ async def upload_json_data(
 
 @app.get("/upload/status/{task_id}")
 async def get_upload_status(task_id: str):
-    """Get the status of an upload task."""
-    # In a real implementation, you'd check the task status from a job queue
-    # For now, return a simple response
-    return {
-        "task_id": task_id,
-        "status": "completed",
-        "message": "Upload processing completed successfully"
-    }
+    """Get the status of an upload or ingestion task."""
+    try:
+        status = await get_task_store().get(task_id)
+    except Exception as e:
+        logger.error(f"Error getting status of task {task_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get task status")
+    
+    if status is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return status
+
+
+async def _iter_files(sources: List[Tuple[DocumentSource, Dict[str, Any]]]) -> AsyncIterator[DocumentChunk]:
+    """Yield the chunks of each uploaded file in turn."""
+    for source_type, filters in sources:
+        async for chunk in ingestion_service.iter_documents(source_type, filters):
+            yield chunk
 
 
 async def _background_file_ingestion(
     task_id: str,
-    source_type: DocumentSource,
-    filters: Dict[str, Any],
-    temp_file_path: str
+    sources: List[Tuple[DocumentSource, Dict[str, Any]]],
+    temp_file_paths: List[str]
 ):
-    """Background task for file ingestion."""
+    """Background task for ingesting one or more uploaded files."""
     try:
         logger.info(f"Starting background file ingestion task {task_id}")
+        await get_task_store().update(task_id, "running")
         
-        # Process the file
-        chunks = await ingestion_service.ingest_documents(
-            source_type=source_type,
-            filters=filters
+        # Process the files, writing chunks in batches as they are produced
+        chunk_count = await get_vector_store().upsert_stream(
+            _iter_files(sources),
+            on_progress=lambda count: get_task_store().advance(task_id, count)
         )
         
-        if chunks:
-            await get_vector_store().upsert_chunks(chunks)
-        
-        logger.info(f"Completed background file ingestion task {task_id}: {len(chunks)} chunks created")
+        logger.info(f"Completed background file ingestion task {task_id}: {chunk_count} chunks created")
+        await get_task_store().update(task_id, "completed")
         
     except Exception as e:
         logger.error(f"Error in background file ingestion task {task_id}: {e}")
+        await get_task_store().update(task_id, "failed", error=str(e))
     finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_file_path)
-        except Exception as e:
-            logger.warning(f"Failed to delete temporary file {temp_file_path}: {e}")
+        # Clean up temporary files
+        _discard_staged(temp_file_paths)
 
 
 async def _background_json_ingestion(
     task_id: str,
-    json_data: List[Dict[str, Any]],
+    temp_file_path: str,
     data_type: str,
     product_version: Optional[str]
 ):
     """Background task for JSON data ingestion."""
     try:
         logger.info(f"Starting background JSON ingestion task {task_id}")
+        await get_task_store().update(task_id, "running")
         
-        chunks = []
-        for item in json_data:
-            # Convert JSON items to document chunks
-            chunk_content = _json_to_text(item, data_type)
-            
-            # Create chunk metadata
-            from app.models import DocumentChunk, DocumentMetadata
-            
-            if data_type == 'helpdesk':
-                doc_id = f"helpdesk_{item.get('id', str(uuid.uuid4()))}"
-                title = item.get('title', 'Helpdesk Ticket')
-                source_type = DocumentSource.ZENDESK  # Using ZENDESK for helpdesk
-            elif data_type == 'zendesk':
-                doc_id = f"zendesk_{item.get('id', str(uuid.uuid4()))}"
-                title = item.get('subject', 'Zendesk Ticket')
-                source_type = DocumentSource.ZENDESK
-            else:
-                doc_id = f"custom_{str(uuid.uuid4())}"
-                title = item.get('title') or item.get('name') or 'Custom Document'
-                source_type = DocumentSource.DOCX
-            
-            metadata = DocumentMetadata(
-                doc_id=doc_id,
-                title=title,
-                source_type=source_type,
-                product_version=product_version,
-                tags=item.get('tags', []),
-                metadata={"source": "json_upload", "data_type": data_type}
-            )
-            
-            chunk = DocumentChunk(
-                chunk_id=str(uuid.uuid4()),
-                doc_id=doc_id,
-                content=chunk_content,
-                metadata=metadata,
-                chunk_index=0
-            )
-            chunks.append(chunk)
-        
-        if chunks:
-            await get_vector_store().upsert_chunks(chunks)
+        # Parse records incrementally and upsert them in batches while parsing continues
+        chunk_count = await get_vector_store().upsert_stream(
+            _iter_json_chunks(temp_file_path, data_type, product_version),
+            on_progress=lambda count: get_task_store().advance(task_id, count)
+        )
         
-        logger.info(f"Completed background JSON ingestion task {task_id}: {len(chunks)} chunks created")
+        logger.info(f"Completed background JSON ingestion task {task_id}: {chunk_count} chunks created")
+        await get_task_store().update(task_id, "completed")
         
     except Exception as e:
         logger.error(f"Error in background JSON ingestion task {task_id}: {e}")
+        await get_task_store().update(task_id, "failed", error=str(e))
+    finally:
+        # Clean up temporary file
+        try:
+            os.unlink(temp_file_path)
+        except Exception as e:
+            logger.warning(f"Failed to delete temporary file {temp_file_path}: {e}")
 
 
-def _json_to_text(item: Dict[str, Any], data_type: str) -> str:
-    """Convert JSON item to searchable text content."""
+async def _iter_json_chunks(
+    file_path: str,
+    data_type: str,
+    product_version: Optional[str]
+) -> AsyncIterator[DocumentChunk]:
+    """Stream one chunk per object in a JSON array file."""
+    to_text = _JSON_TO_TEXT[data_type]
+    async with aiofiles.open(file_path, "rb") as f:
+        async for item in ijson.items(f, "item", use_float=True):
+            if isinstance(item, dict):
+                yield _json_to_chunk(item, data_type, product_version, to_text(item))
+
+
+def _json_to_chunk(
+    item: Dict[str, Any],
+    data_type: str,
+    product_version: Optional[str],
+    chunk_content: str
+) -> DocumentChunk:
+    """Convert a JSON item and its text content to a single document chunk."""
     if data_type == 'helpdesk':
-        return f"""
-        Ticket ID: {item.get('id', 'N/A')}
-        Title: {item.get('title', 'N/A')}
-        Description: {item.get('description', 'N/A')}
-        Category: {item.get('category', 'N/A')}
-        Priority: {item.get('priority', 'N/A')}
-        Status: {item.get('status', 'N/A')}
-        Resolution: {item.get('resolution', 'N/A')}
-        Tags: {', '.join(item.get('tags', []))}
-        """
+        doc_id = f"helpdesk_{item.get('id') or uuid.uuid4().hex}"
+        title = item.get('title', 'Helpdesk Ticket')
+        source_type = DocumentSource.ZENDESK  # Using ZENDESK for helpdesk
     elif data_type == 'zendesk':
-        text = f"""
-        Ticket ID: {item.get('id', 'N/A')}
-        Subject: {item.get('subject', 'N/A')}
-        Description: {item.get('description', 'N/A')}
-        Priority: {item.get('priority', 'N/A')}
-        Status: {item.get('status', 'N/A')}
-        Tags: {', '.join(item.get('tags', []))}
-        """
-        
-        # Add comments if available
-        comments = item.get('comments', [])
-        if comments:
-            text += "\nComments:\n"
-            for comment in comments:
-                text += f"- {comment.get('body', 'N/A')}\n"
-        
-        return text
+        doc_id = f"zendesk_{item.get('id') or uuid.uuid4().hex}"
+        title = item.get('subject', 'Zendesk Ticket')
+        source_type = DocumentSource.ZENDESK
     else:
-        # For custom data, try to extract common fields
-        text_parts = []
-        for key, value in item.items():
-            if isinstance(value, (str, int, float)):
-                text_parts.append(f"{key}: {value}")
-            elif isinstance(value, list):
-                text_parts.append(f"{key}: {', '.join(map(str, value))}")
-        
-        return '\n'.join(text_parts)
+        doc_id = f"custom_{uuid.uuid4().hex}"
+        title = item.get('title') or item.get('name') or 'Custom Document'
+        source_type = DocumentSource.DOCX
+    
+    metadata = DocumentMetadata(
+        doc_id=doc_id,
+        title=title,
+        source_type=source_type,
+        product_version=product_version,
+        tags=item.get('tags', []),
+        metadata={"source": "json_upload", "data_type": data_type}
+    )
+    
+    return DocumentChunk.model_construct(
+        chunk_id=f"{doc_id}_0",
+        doc_id=doc_id,
+        content=chunk_content,
+        metadata=metadata,
+        chunk_index=0
+    )
+
+
+class _JsonFields(dict):
+    """JSON item fields for str.format_map, with 'N/A' for missing keys."""
+    
+    def __missing__(self, key: str) -> str:
+        return 'N/A'
+
+
+_HELPDESK_TEMPLATE = """
+        Ticket ID: {id}
+        Title: {title}
+        Description: {description}
+        Category: {category}
+        Priority: {priority}
+        Status: {status}
+        Resolution: {resolution}
+        Tags: {tags}
+        """
+
+_ZENDESK_TEMPLATE = """
+        Ticket ID: {id}
+        Subject: {subject}
+        Description: {description}
+        Priority: {priority}
+        Status: {status}
+        Tags: {tags}
+        """
+
+
+def _helpdesk_to_text(item: Dict[str, Any]) -> str:
+    """Convert a helpdesk ticket to searchable text content."""
+    return _HELPDESK_TEMPLATE.format_map(_JsonFields(item, tags=', '.join(item.get('tags', []))))
+
+
+def _zendesk_to_text(item: Dict[str, Any]) -> str:
+    """Convert a Zendesk ticket, with its comments, to searchable text content."""
+    text = _ZENDESK_TEMPLATE.format_map(_JsonFields(item, tags=', '.join(item.get('tags', []))))
+    
+    # Add comments if available
+    comments = item.get('comments', [])
+    if comments:
+        text += "\nComments:\n" + "".join(f"- {comment.get('body', 'N/A')}\n" for comment in comments)
+    
+    return text
+
+
+def _custom_to_text(item: Dict[str, Any]) -> str:
+    """Convert a custom JSON item to searchable text content."""
+    # For custom data, try to extract common fields
+    text_parts = []
+    for key, value in item.items():
+        if isinstance(value, (str, int, float)):
+            text_parts.append(f"{key}: {value}")
+        elif isinstance(value, list):
+            text_parts.append(f"{key}: {', '.join(map(str, value))}")
+    
+    return '\n'.join(text_parts)
+
+
+# Text converter per upload data type, chosen once per upload rather than per record
+_JSON_TO_TEXT = {
+    'helpdesk': _helpdesk_to_text,
+    'zendesk': _zendesk_to_text,
+    'custom': _custom_to_text
+}
 
 
 @app.exception_handler(Exception)
@@ -664,12 +1009,32 @@ async def global_exception_handler(request, exc):
 
 
 @app.get("/documents")
-async def get_documents():
-    """Get all documents in the knowledge base."""
+async def get_documents(request: Request):
+    """Get all documents in the knowledge base, answering 304 while the list is unchanged."""
     try:
-        vector_store = get_vector_store()
-        documents = await vector_store.get_all_documents()
-        return {"documents": documents}
+        if_none_match = request.headers.get("if-none-match")
+        
+        # The shared index's version changes with every upsert or delete, so an unchanged
+        # list is confirmed without reading it; otherwise the ETag is a hash of the list
+        document_index = get_document_index()
+        etag = None
+        if document_index.persistent:
+            etag = f'W/"{await document_index.version()}"'
+            if if_none_match == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+        
+        documents = await get_vector_store().get_all_documents()
+        body = orjson.dumps({"documents": documents}, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        if etag is None:
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            if if_none_match == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+        
+        return Response(
+            body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "private, max-age=5"}
+        )
     except Exception as e:
         logger.error(f"Error fetching documents: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch documents")
@@ -698,5 +1063,7 @@ if __name__ == "__main__":
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
         reload=settings.environment == "development"
     )
@@ -13,7 +13,7 @@ show_help() {
     echo ""
     echo "Commands:"
     echo "  switch-llm <provider>    Switch LLM provider (ollama|openai)"
-    echo "  switch-embeddings <provider>    Switch embedding provider (local|openai)"
+    echo "  switch-embeddings <provider>    Switch embedding provider (local|onnx|static|openai)"
     echo "  switch-vectordb <provider>    Switch vector database (weaviate|pinecone)"
     echo "  set-openai-key <key>     Set OpenAI API key"
     echo "  set-pinecone-key <key>   Set Pinecone API key"
@@ -62,8 +62,8 @@ switch_llm() {
 
 switch_embeddings() {
     local provider=$1
-    if [[ "$provider" != "local" && "$provider" != "openai" ]]; then
-        echo "❌ Invalid embedding provider. Use 'local' or 'openai'"
+    if [[ "$provider" != "local" && "$provider" != "onnx" && "$provider" != "static" && "$provider" != "openai" ]]; then
+        echo "❌ Invalid embedding provider. Use 'local', 'onnx', 'static' or 'openai'"
         exit 1
     fi
     
@@ -9,20 +9,53 @@ from various sources into the chatbot's vector database.
 
 import argparse
 import asyncio
-import json
+import hashlib
+import orjson
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add the backend directory to the Python path
 sys.path.append(str(Path(__file__).parent / "backend"))
 
+from app.config import settings
 from app.services.ingestion import ingestion_service
-from app.services.vector_store import vector_store
-from app.models import DocumentSource
+from app.services.vector_store import get_vector_store
+from app.models import DocumentChunk, DocumentSource
 
+# Chunks sent to the vector store per upsert call
+DEFAULT_BATCH_SIZE = 500
 
-async def ingest_pdf(file_path: str, title: str = None, product_version: str = None, tags: List[str] = None):
+# Config "source_type" values resolved with one dict lookup instead of an enum call per source
+SOURCE_TYPES = {source.value: source for source in DocumentSource}
+
+# Written next to the config file; maps each file source to the content hash last ingested
+MANIFEST_NAME = ".ingest_manifest.json"
+
+
+async def store_chunks(chunks: List[DocumentChunk], batch_size: int = DEFAULT_BATCH_SIZE):
+    """Upsert chunks into the vector store in slices of `batch_size`."""
+    vector_store = get_vector_store()
+    for i in range(0, len(chunks), batch_size):
+        await vector_store.upsert_chunks(chunks[i:i + batch_size])
+
+
+async def stream_source(source_type: DocumentSource, label: str, filters: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Ingest a source, upserting each batch while the next is still being produced.
+    
+    Returns how many chunks were stored.
+    """
+    chunks = ingestion_service.iter_documents(source_type, filters)
+    count = await get_vector_store().upsert_stream(chunks, batch_size=batch_size)
+    
+    if count:
+        print(f"✅ Successfully ingested {count} chunks from {label}")
+    else:
+        print(f"❌ No chunks generated from {label}")
+    return count
+
+
+async def ingest_pdf(file_path: str, title: str = None, product_version: str = None, tags: List[str] = None, batch_size: int = DEFAULT_BATCH_SIZE):
     """Ingest a PDF document."""
     filters = {
         "file_path": file_path,
@@ -32,17 +65,10 @@ async def ingest_pdf(file_path: str, title: str = None, product_version: str = N
     }
     
     print(f"📄 Ingesting PDF: {file_path}")
-    chunks = await ingestion_service.ingest_documents(DocumentSource.PDF, filters)
-    
-    if chunks:
-        print(f"💾 Storing {len(chunks)} chunks in vector database...")
-        await vector_store.upsert_chunks(chunks)
-        print(f"✅ Successfully ingested {len(chunks)} chunks from PDF")
-    else:
-        print("❌ No chunks generated from PDF")
+    await stream_source(DocumentSource.PDF, "PDF", filters, batch_size)
 
 
-async def ingest_docx(file_path: str, title: str = None, product_version: str = None, tags: List[str] = None):
+async def ingest_docx(file_path: str, title: str = None, product_version: str = None, tags: List[str] = None, batch_size: int = DEFAULT_BATCH_SIZE):
     """Ingest a Word document."""
     filters = {
         "file_path": file_path,
@@ -52,17 +78,10 @@ async def ingest_docx(file_path: str, title: str = None, product_version: str =
     }
     
     print(f"📄 Ingesting DOCX: {file_path}")
-    chunks = await ingestion_service.ingest_documents(DocumentSource.DOCX, filters)
-    
-    if chunks:
-        print(f"💾 Storing {len(chunks)} chunks in vector database...")
-        await vector_store.upsert_chunks(chunks)
-        print(f"✅ Successfully ingested {len(chunks)} chunks from DOCX")
-    else:
-        print("❌ No chunks generated from DOCX")
+    await stream_source(DocumentSource.DOCX, "DOCX", filters, batch_size)
 
 
-async def ingest_zendesk(limit: int = 100, product_version: str = None):
+async def ingest_zendesk(limit: int = 100, product_version: str = None, batch_size: int = DEFAULT_BATCH_SIZE):
     """Ingest Zendesk tickets."""
     filters = {
         "limit": limit,
@@ -70,17 +89,10 @@ async def ingest_zendesk(limit: int = 100, product_version: str = None):
     }
     
     print(f"🎫 Ingesting {limit} Zendesk tickets...")
-    chunks = await ingestion_service.ingest_documents(DocumentSource.ZENDESK, filters)
-    
-    if chunks:
-        print(f"💾 Storing {len(chunks)} chunks in vector database...")
-        await vector_store.upsert_chunks(chunks)
-        print(f"✅ Successfully ingested {len(chunks)} chunks from Zendesk")
-    else:
-        print("❌ No chunks generated from Zendesk")
+    await stream_source(DocumentSource.ZENDESK, "Zendesk", filters, batch_size)
 
 
-async def ingest_jira(jql: str = "project is not EMPTY", limit: int = 100, product_version: str = None):
+async def ingest_jira(jql: str = "project is not EMPTY", limit: int = 100, product_version: str = None, batch_size: int = DEFAULT_BATCH_SIZE):
     """Ingest Jira issues."""
     filters = {
         "jql": jql,
@@ -89,40 +101,118 @@ async def ingest_jira(jql: str = "project is not EMPTY", limit: int = 100, produ
     }
     
     print(f"🐛 Ingesting Jira issues with JQL: {jql}")
-    chunks = await ingestion_service.ingest_documents(DocumentSource.JIRA, filters)
-    
-    if chunks:
-        print(f"💾 Storing {len(chunks)} chunks in vector database...")
-        await vector_store.upsert_chunks(chunks)
-        print(f"✅ Successfully ingested {len(chunks)} chunks from Jira")
-    else:
-        print("❌ No chunks generated from Jira")
+    await stream_source(DocumentSource.JIRA, "Jira", filters, batch_size)
 
 
-async def ingest_from_config(config_file: str):
-    """Ingest from a configuration file."""
-    with open(config_file, 'r') as f:
-        config = json.load(f)
+async def ingest_source(source_config: Dict[str, Any], semaphore: asyncio.Semaphore) -> Tuple[bool, List[DocumentChunk], str]:
+    """Ingest one configured source, returning whether it succeeded, its chunks and a status line."""
+    source_type = SOURCE_TYPES.get(source_config.get("source_type"))
+    if source_type is None:
+        return False, [], f"❌ Unknown source type: {source_config.get('source_type')}"
+    filters = source_config.get("filters", {})
     
-    for source_config in config.get("sources", []):
-        source_type = DocumentSource(source_config["source_type"])
-        filters = source_config.get("filters", {})
-        
-        print(f"📥 Ingesting from {source_type.value}...")
+    async with semaphore:
         try:
             chunks = await ingestion_service.ingest_documents(source_type, filters)
-            
-            if chunks:
-                await vector_store.upsert_chunks(chunks)
-                print(f"✅ Successfully ingested {len(chunks)} chunks from {source_type.value}")
-            else:
-                print(f"❌ No chunks generated from {source_type.value}")
         except Exception as e:
-            print(f"❌ Error ingesting from {source_type.value}: {e}")
+            return False, [], f"❌ Error ingesting from {source_type.value}: {e}"
+    
+    if chunks:
+        return True, chunks, f"✅ Generated {len(chunks)} chunks from {source_type.value}"
+    return True, chunks, f"❌ No chunks generated from {source_type.value}"
+
+
+def source_key(source_config: Dict[str, Any]) -> str:
+    """Stable manifest key for a configured source."""
+    return orjson.dumps(source_config, option=orjson.OPT_SORT_KEYS).decode()
+
+
+def file_fingerprint(source_config: Dict[str, Any]) -> Optional[str]:
+    """Content hash of a file source, or None for API sources and missing files.
+    
+    API sources (Zendesk, Jira) can't be checked without querying them, so they are
+    always re-ingested; unchanged chunks are still skipped by the vector store.
+    """
+    file_path = source_config.get("filters", {}).get("file_path")
+    if not file_path or not Path(file_path).is_file():
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def ingest_from_config(config_file: str, batch_size: int = DEFAULT_BATCH_SIZE, full: bool = False):
+    """Ingest from a configuration file, skipping file sources unchanged since the last run."""
+    # Read off the event loop so concurrent ingestion isn't stalled by file I/O
+    config = orjson.loads(await asyncio.to_thread(Path(config_file).read_bytes))
+    manifest_path = Path(config_file).with_name(MANIFEST_NAME)
+    manifest = {}
+    if manifest_path.is_file():
+        try:
+            manifest = orjson.loads(await asyncio.to_thread(manifest_path.read_bytes))
+        except orjson.JSONDecodeError:
+            print(f"⚠️  Ignoring unreadable manifest {manifest_path}")
+        if not isinstance(manifest, dict):
+            print(f"⚠️  Ignoring malformed manifest {manifest_path}")
+            manifest = {}
+    
+    sources = []
+    fingerprints = {}
+    for source_config in config.get("sources", []):
+        key = source_key(source_config)
+        fingerprint = await asyncio.to_thread(file_fingerprint, source_config)
+        if not full and fingerprint is not None and manifest.get(key) == fingerprint:
+            print(f"⏭️  Skipping unchanged {source_config['filters']['file_path']}")
+            continue
+        sources.append(source_config)
+        fingerprints[key] = fingerprint
+    
+    # Sources are independent, so they are ingested concurrently; their chunks
+    # are then stored together at the end, in full batches
+    print(f"📥 Ingesting from {len(sources)} sources...")
+    semaphore = asyncio.Semaphore(settings.max_concurrent_ingests)
+    results = await asyncio.gather(
+        *(ingest_source(source_config, semaphore) for source_config in sources)
+    )
+    
+    # Statuses are reported once all sources finish, in config order
+    if results:
+        print("\n".join(status for _, _, status in results))
+    all_chunks = [chunk for _, chunks, _ in results for chunk in chunks]
+    
+    if all_chunks:
+        print(f"💾 Storing {len(all_chunks)} chunks in vector database...")
+        await store_chunks(all_chunks, batch_size)
+        print(f"✅ Successfully ingested {len(all_chunks)} chunks")
+    
+    # Only record file sources once their chunks are stored, so failed ones are retried
+    for source_config, (ok, _, _) in zip(sources, results):
+        key = source_key(source_config)
+        if ok and fingerprints[key] is not None:
+            manifest[key] = fingerprints[key]
+    await asyncio.to_thread(manifest_path.write_bytes, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+
+# Subcommand handlers; each takes the parsed arguments of its subcommand as keyword arguments
+COMMANDS = {
+    "pdf": ingest_pdf,
+    "docx": ingest_docx,
+    "zendesk": ingest_zendesk,
+    "jira": ingest_jira,
+    "config": ingest_from_config,
+}
 
 
 async def main():
     parser = argparse.ArgumentParser(description="Ingest data into AI Support Chatbot")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Chunks per vector store upsert")
+    parser.add_argument(
+        "--embedding-batch-size",
+        type=int,
+        help=f"Chunk texts per embedding request (default: {settings.embedding_batch_size})"
+    )
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # PDF ingestion
@@ -153,6 +243,7 @@ async def main():
     # Config file ingestion
     config_parser = subparsers.add_parser("config", help="Ingest from configuration file")
     config_parser.add_argument("config_file", help="Path to JSON configuration file")
+    config_parser.add_argument("--full", action="store_true", help="Re-ingest every source, ignoring the manifest of unchanged files")
     
     args = parser.parse_args()
     
@@ -162,29 +253,16 @@ async def main():
     
     # Initialize vector store
     print("🔌 Initializing vector store...")
-    await vector_store.initialize()
+    await get_vector_store().initialize()
     
+    kwargs = vars(args)
+    embedding_batch_size = kwargs.pop("embedding_batch_size")
+    if embedding_batch_size:
+        # Each upsert batch is embedded in requests of this many texts
+        settings.embedding_batch_size = embedding_batch_size
+    command = COMMANDS[kwargs.pop("command")]
     try:
-        if args.command == "pdf":
-            await ingest_pdf(
-                args.file_path,
-                args.title,
-                args.product_version,
-                args.tags
-            )
-        elif args.command == "docx":
-            await ingest_docx(
-                args.file_path,
-                args.title,
-                args.product_version,
-                args.tags
-            )
-        elif args.command == "zendesk":
-            await ingest_zendesk(args.limit, args.product_version)
-        elif args.command == "jira":
-            await ingest_jira(args.jql, args.limit, args.product_version)
-        elif args.command == "config":
-            await ingest_from_config(args.config_file)
+        await command(**kwargs)
     
     except Exception as e:
         print(f"❌ Error during ingestion: {e}")
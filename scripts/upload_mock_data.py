@@ -8,26 +8,69 @@ This script uploads mock data files to populate the knowledge base for testing.
 import asyncio
 import aiohttp
 import json
+import logging
+import orjson
 import os
+import socket
 import sys
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlparse
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 MOCK_DATA_DIR = Path(__file__).parent.parent / "mock_data"
+MAX_CONCURRENT_UPLOADS = 8
+
+# Per-upload results are logged with lazy formatting rather than printed
+logger = logging.getLogger(__name__)
+
+def create_session(base_url: str) -> aiohttp.ClientSession:
+    """Create a keep-alive session whose pooled connections are reused by every upload."""
+    # Resolve the API host once and reuse the answer; localhost goes straight to IPv4
+    # instead of probing IPv6 first
+    family = socket.AF_INET if urlparse(base_url).hostname == "localhost" else 0
+    connector = aiohttp.TCPConnector(
+        limit=100, use_dns_cache=True, ttl_dns_cache=600, family=family, keepalive_timeout=60
+    )
+    # orjson serializes request bodies several times faster than the stdlib json aiohttp uses
+    return aiohttp.ClientSession(connector=connector, json_serialize=lambda obj: orjson.dumps(obj).decode())
+
+@lru_cache(maxsize=None)
+def _form_fields(metadata: FrozenSet[Tuple[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    """Non-empty metadata fields, worked out once per distinct metadata set."""
+    return tuple((key, value) for key, value in sorted(metadata) if value)
+
+def _build_form(file, filename: str, content_type: str, metadata: Dict[str, Any]) -> aiohttp.FormData:
+    """Build an upload form streaming `file`, with the non-empty metadata as extra fields."""
+    data = aiohttp.FormData()
+    data.add_field('file', file, filename=filename, content_type=content_type)
+    for key, value in _form_fields(frozenset(metadata.items())):
+        data.add_field(key, value)
+    return data
 
 class MockDataUploader:
-    def __init__(self, base_url: str = API_BASE_URL):
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        session: Optional[aiohttp.ClientSession] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS
+    ):
         self.base_url = base_url
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
+        # Caps how many uploads are in flight at once so the backend isn't overwhelmed
+        self._sem = asyncio.Semaphore(max_concurrent_uploads)
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = create_session(self.base_url)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
     
     async def check_api_health(self) -> bool:
@@ -35,10 +78,12 @@ class MockDataUploader:
         try:
             async with self.session.get(f"{self.base_url}/health") as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     print(f"✅ API is healthy: {data.get('status')}")
                     return True
                 else:
+                    # Drain the unused body so the connection goes back to the pool
+                    await response.read()
                     print(f"❌ API health check failed: {response.status}")
                     return False
         except Exception as e:
@@ -47,63 +92,81 @@ class MockDataUploader:
     
     async def upload_file(self, file_path: Path, **kwargs) -> Dict[str, Any]:
         """Upload a file to the API."""
+        async with self._sem:
+            return await self._upload_file(file_path, **kwargs)
+    
+    async def _upload_file(self, file_path: Path, **kwargs) -> Dict[str, Any]:
         try:
-            data = aiohttp.FormData()
-            
-            # Add file content
+            # The open file is streamed into the multipart body instead of being read up front
             with open(file_path, 'rb') as f:
-                file_content = f.read()
-            data.add_field('file', file_content, filename=file_path.name)
-            
-            # Add optional fields
-            for key, value in kwargs.items():
-                if value:
-                    data.add_field(key, value)
-            
-            async with self.session.post(f"{self.base_url}/upload/file", data=data) as response:
-                result = await response.json()
+                data = _build_form(f, file_path.name, 'application/octet-stream', kwargs)
                 
-                if response.status == 200:
-                    print(f"✅ Uploaded {file_path.name}: {result.get('message')}")
-                    return result
-                else:
-                    print(f"❌ Failed to upload {file_path.name}: {result.get('detail')}")
+                async with self.session.post(f"{self.base_url}/upload/file", data=data) as response:
+                    result = orjson.loads(await response.read())
+                    
+                    if response.status == 200:
+                        logger.info("✅ Uploaded %s: %s", file_path.name, result.get('message'))
+                        return result
+                    else:
+                        logger.error("❌ Failed to upload %s: %s", file_path.name, result.get('detail'))
+                        return result
+                    
+        except Exception as e:
+            logger.error("❌ Error uploading %s: %s", file_path.name, e)
+            return {"error": str(e)}
+    
+    async def upload_files(self, files: List[Tuple[Path, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Upload several document files, each with its metadata, in a single request."""
+        async with self._sem:
+            return await self._upload_files(files)
+    
+    async def _upload_files(self, files: List[Tuple[Path, Dict[str, Any]]]) -> Dict[str, Any]:
+        names = ", ".join(file_path.name for file_path, _ in files)
+        try:
+            # Every file is streamed into one multipart body, with their metadata as a JSON array
+            with ExitStack() as stack:
+                data = aiohttp.FormData()
+                for file_path, _ in files:
+                    f = stack.enter_context(open(file_path, 'rb'))
+                    data.add_field('files', f, filename=file_path.name, content_type='application/octet-stream')
+                data.add_field('metadatas', orjson.dumps([metadata for _, metadata in files]).decode())
+                
+                async with self.session.post(f"{self.base_url}/upload/files", data=data) as response:
+                    result = orjson.loads(await response.read())
+                    
+                    if response.status == 200:
+                        logger.info("✅ Uploaded %s: %s", names, result.get('message'))
+                    else:
+                        logger.error("❌ Failed to upload %s: %s", names, result.get('detail'))
                     return result
                     
         except Exception as e:
-            print(f"❌ Error uploading {file_path.name}: {e}")
+            logger.error("❌ Error uploading %s: %s", names, e)
             return {"error": str(e)}
     
     async def upload_json_data(self, file_path: Path, data_type: str, **kwargs) -> Dict[str, Any]:
         """Upload JSON data to the API."""
+        async with self._sem:
+            return await self._upload_json_data(file_path, data_type, **kwargs)
+    
+    async def _upload_json_data(self, file_path: Path, data_type: str, **kwargs) -> Dict[str, Any]:
         try:
-            data = aiohttp.FormData()
-            
-            # Add file content
+            # The open file is streamed into the multipart body instead of being read up front
             with open(file_path, 'rb') as f:
-                file_content = f.read()
-            data.add_field('file', file_content, filename=file_path.name)
-            
-            # Add data type
-            data.add_field('data_type', data_type)
-            
-            # Add optional fields
-            for key, value in kwargs.items():
-                if value:
-                    data.add_field(key, value)
-            
-            async with self.session.post(f"{self.base_url}/upload/json", data=data) as response:
-                result = await response.json()
+                data = _build_form(f, file_path.name, 'application/json', {"data_type": data_type, **kwargs})
                 
-                if response.status == 200:
-                    print(f"✅ Uploaded {file_path.name} ({data_type}): {result.get('message')}")
-                    return result
-                else:
-                    print(f"❌ Failed to upload {file_path.name}: {result.get('detail')}")
-                    return result
+                async with self.session.post(f"{self.base_url}/upload/json", data=data) as response:
+                    result = orjson.loads(await response.read())
+                    
+                    if response.status == 200:
+                        logger.info("✅ Uploaded %s (%s): %s", file_path.name, data_type, result.get('message'))
+                        return result
+                    else:
+                        logger.error("❌ Failed to upload %s: %s", file_path.name, result.get('detail'))
+                        return result
                     
         except Exception as e:
-            print(f"❌ Error uploading {file_path.name}: {e}")
+            logger.error("❌ Error uploading %s: %s", file_path.name, e)
             return {"error": str(e)}
 
 async def main():
@@ -124,7 +187,7 @@ async def main():
             print("❌ API is not available. Please start the backend service.")
             return
         
-        print("\n📄 Uploading document files...")
+        print("\n📄 Uploading documents and JSON data...")
         
         # Upload document files
         document_files = [
@@ -145,28 +208,35 @@ async def main():
             })
         ]
         
+        # Upload JSON data
+        json_files = [
+            ("helpdesk_tickets.json", "helpdesk", {"product_version": "v2.1.0"}),
+            ("zendesk_tickets.json", "zendesk", {"product_version": "v2.1.0"})
+        ]
+        
+        # Uploads are independent, so they all run concurrently (bounded by the uploader)
+        documents = []
         for filename, metadata in document_files:
             file_path = MOCK_DATA_DIR / filename
             if file_path.exists():
-                await uploader.upload_file(file_path, **metadata)
+                documents.append((file_path, metadata))
             else:
                 print(f"⚠️  File not found: {filename}")
         
-        print("\n📊 Uploading JSON data...")
-        
-        # Upload JSON data
-        json_files = [
-            ("helpdesk_tickets.json", "helpdesk", {"product_version": "v2.1.0"}),
-            ("zendesk_tickets.json", "zendesk", {"product_version": "v2.1.0"})
-        ]
+        # All documents go in one request to the bulk upload endpoint
+        uploads = [uploader.upload_files(documents)] if documents else []
         
         for filename, data_type, metadata in json_files:
             file_path = MOCK_DATA_DIR / filename
             if file_path.exists():
-                await uploader.upload_json_data(file_path, data_type, **metadata)
+                uploads.append(uploader.upload_json_data(file_path, data_type, **metadata))
             else:
                 print(f"⚠️  File not found: {filename}")
         
+        results = await asyncio.gather(*uploads)
+        failed = sum(1 for result in results if "error" in result or "detail" in result)
+        print(f"\n📦 {len(results) - failed}/{len(results)} uploads succeeded")
+        
         print("\n✅ Mock data upload completed!")
         print("\n💡 You can now test the chatbot with questions like:")
         print("   • 'How do I authenticate with the API?'")
@@ -214,6 +284,8 @@ Authorization: Bearer YOUR_API_KEY
         print(f"✅ Created {api_doc_path.name}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     # Check command line arguments
     if len(sys.argv) > 1 and sys.argv[1] == "--create-samples":
         create_sample_files()